@@ -8,13 +8,19 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.const import Platform
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .coordinator import MusoCoordinator
-from .const import LOGGER as _LOGGER
+from .browse_catalog import browse_catalog_store
+from .warm_start import warm_start_store
+from .const import DOMAIN, LOGGER as _LOGGER
+from .services import async_setup_services
 
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 PLATFORMS: list[Platform] = [
     Platform.MEDIA_PLAYER,
     Platform.SENSOR,
@@ -30,6 +36,12 @@ class RuntimeData:
     coordinator: DataUpdateCoordinator
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services shared by all naim Mu-so config entries."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up naim Mu-so controller from a config entry."""
 
@@ -39,14 +51,8 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     # hass.data[DOMAIN][entry.entry_id] = MyApi(...)
     coordinator = MusoCoordinator(hass=hass, config_entry=config_entry)
 
-    # Perform an initial data load from api.
-    # async_config_entry_first_refresh() is special in that it does not log errors if it fails
-    await coordinator.async_config_entry_first_refresh()
-
-    # Test to see if api initialised correctly, else raise ConfigNotReady to make HA retry setup
-    # TODO: Change this to match how your api will know if connected or successful update
-    if not coordinator._device:
-        raise ConfigEntryNotReady
+    # Don't wait for the device, it may be asleep or offline. Entities are
+    # unavailable until it connects and the first state arrives.
     # Initialise a listener for config flow options changes.
     # This will be removed automatically if the integraiton is unloaded.
     # See config_flow for defining an options setting that shows up as configure
@@ -61,6 +67,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     config_entry.runtime_data = RuntimeData(coordinator)
 
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    coordinator.async_start()
 
     return True
 
@@ -87,6 +94,12 @@ async def async_remove_config_entry_device(
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted state of a removed config entry."""
+    await warm_start_store(hass, entry.entry_id).async_remove()
+    await browse_catalog_store(hass, entry.entry_id).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     # Forward to the same platform as async_setup_entry did
@@ -0,0 +1,292 @@
+"""On-disk cache of album art and station logos."""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import io
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    ART_CACHE_MAX_BYTES,
+    ART_FETCH_TIMEOUT,
+    ART_REGISTERED_MAX,
+    ART_REVALIDATE_AFTER,
+    ART_VARIANTS,
+    DOMAIN,
+    LOGGER as _LOGGER,
+)
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    Image = None
+
+
+@dataclass
+class ArtCacheStats:
+    """Statistics on the art cache."""
+
+    hits: int = 0
+    fetches: int = 0
+    revalidated: int = 0
+    evictions: int = 0
+    errors: int = 0
+    size: int = 0
+
+
+@dataclass
+class _Entry:
+    """Art stored on disk, with what is needed to revalidate it."""
+
+    url: str
+    content_type: str
+    etag: str | None
+    last_modified: str | None
+    # time.time() the art was last fetched or revalidated
+    checked: float
+    # time.time() the art was last served, for the LRU order
+    used: float
+    size: int
+
+
+class ArtCache:
+    """Serve art from an on-disk LRU cache, keeping resized variants.
+
+    Art is fetched once and revalidated with If-None-Match and
+    If-Modified-Since when it is older than ART_REVALIDATE_AFTER, so every
+    piece of art is downloaded once per change rather than once per viewer.
+    Each variant of ART_VARIANTS is resized when the art is fetched, if Pillow
+    is available. The least recently used art is removed once the cache
+    grows over ART_CACHE_MAX_BYTES.
+
+    Only URLs registered with async_register, at most ART_REGISTERED_MAX,
+    and art already cached are served, the image ids handed to the frontend
+    are opaque.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.directory = Path(hass.config.path(".cache", DOMAIN, "art"))
+        self.stats = ArtCacheStats()
+        self._entries: dict[str, _Entry] | None = None
+        # Registered URLs by image id, least recently registered first
+        self._urls: OrderedDict[str, str] = OrderedDict()
+        self._fetches: dict[str, asyncio.Task[_Entry | None]] = {}
+        self._load_lock = asyncio.Lock()
+
+    @staticmethod
+    def image_id(url: str) -> str:
+        """Return the opaque id of the art at url."""
+        return hashlib.sha256(url.encode()).hexdigest()[:32]
+
+    @callback
+    def async_register(self, url: str) -> str:
+        """Allow serving the art at url and return its image id."""
+        image_id = self.image_id(url)
+        self._urls[image_id] = url
+        self._urls.move_to_end(image_id)
+        if len(self._urls) > ART_REGISTERED_MAX:
+            self._urls.popitem(last=False)
+        return image_id
+
+    def url(self, image_id: str) -> str | None:
+        """Return the registered URL of an image id.
+
+        Art that is cached stays served after its registration was dropped.
+        """
+        if url := self._urls.get(image_id):
+            return url
+        if self._entries and (entry := self._entries.get(image_id)):
+            return entry.url
+        return None
+
+    async def async_get(
+        self, url: str, variant: str
+    ) -> tuple[bytes | None, str | None]:
+        """Return the image data and content type of a variant of the art at url."""
+        key = self.async_register(url)
+        entries = await self._async_entries()
+        entry = entries.get(key)
+        if entry is None or time.time() - entry.checked > ART_REVALIDATE_AFTER:
+            if not (fetch := self._fetches.get(key)):
+                fetch = self._fetches[key] = self.hass.async_create_task(
+                    self._async_fetch(key, url, entry), eager_start=False
+                )
+                fetch.add_done_callback(lambda _: self._fetches.pop(key, None))
+            entry = await asyncio.shield(fetch)
+        else:
+            self.stats.hits += 1
+        if entry is None:
+            return None, None
+
+        entry.used = time.time()
+        try:
+            data = await self.hass.async_add_executor_job(
+                self._read, key, variant, entry
+            )
+        except OSError as err:
+            _LOGGER.debug("Failed to read cached art %s: %r", url, err)
+            entries.pop(key, None)
+            return None, None
+        return data, entry.content_type
+
+    async def _async_entries(self) -> dict[str, _Entry]:
+        """Return the cached entries, reading them from disk the first time."""
+        async with self._load_lock:
+            if self._entries is None:
+                self._entries = await self.hass.async_add_executor_job(self._load)
+                self.stats.size = sum(e.size for e in self._entries.values())
+        return self._entries
+
+    async def _async_fetch(self, key: str, url: str, entry: _Entry | None) -> _Entry | None:
+        """Fetch or revalidate the art at url, returns None if there is none."""
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        session = async_get_clientsession(self.hass)
+        try:
+            async with (
+                asyncio.timeout(ART_FETCH_TIMEOUT),
+                session.get(url, headers=headers) as response,
+            ):
+                not_modified = response.status == HTTPStatus.NOT_MODIFIED
+                if not (entry and not_modified):
+                    response.raise_for_status()
+                    data = await response.read()
+                    content_type = response.headers.get("Content-Type", "image/jpeg")
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+        except (TimeoutError, aiohttp.ClientError) as err:
+            self.stats.errors += 1
+            _LOGGER.debug("Failed to fetch art %s: %r", url, err)
+            # Serve the art we have rather than none
+            return entry
+
+        if entry and not_modified:
+            self.stats.revalidated += 1
+            entry.checked = time.time()
+            await self.hass.async_add_executor_job(self._write_meta, key, entry)
+            return entry
+
+        self.stats.fetches += 1
+        now = time.time()
+        new_entry = _Entry(
+            url=url,
+            content_type=content_type,
+            etag=etag,
+            last_modified=last_modified,
+            checked=now,
+            used=now,
+            size=0,
+        )
+        try:
+            await self.hass.async_add_executor_job(self._store, key, data, new_entry)
+        except OSError as err:
+            self.stats.errors += 1
+            _LOGGER.warning("Failed to cache art in %s: %r", self.directory, err)
+            return None
+        entries = await self._async_entries()
+        if old := entries.get(key):
+            self.stats.size -= old.size
+        entries[key] = new_entry
+        self.stats.size += new_entry.size
+        await self._async_evict()
+        return new_entry
+
+    async def _async_evict(self) -> None:
+        """Remove the least recently used art until the cache fits."""
+        entries = await self._async_entries()
+        if self.stats.size <= ART_CACHE_MAX_BYTES:
+            return
+        keys = []
+        for key, entry in sorted(entries.items(), key=lambda item: item[1].used):
+            if self.stats.size <= ART_CACHE_MAX_BYTES:
+                break
+            del entries[key]
+            self.stats.size -= entry.size
+            self.stats.evictions += 1
+            keys.append(key)
+        await self.hass.async_add_executor_job(self._remove, keys)
+
+    def _load(self) -> dict[str, _Entry]:
+        """Read the metadata of the cached art."""
+        entries = {}
+        if not self.directory.is_dir():
+            return entries
+        for meta in self.directory.glob("*.json"):
+            try:
+                # The last use is kept as the modification time of the metadata
+                entries[meta.stem] = _Entry(
+                    **json.loads(meta.read_text()), used=meta.stat().st_mtime
+                )
+            except (OSError, ValueError, TypeError):
+                continue
+        return entries
+
+    def _read(self, key: str, variant: str, entry: _Entry) -> bytes:
+        """Read a variant of cached art, marking it used."""
+        path = self.directory / f"{key}-{variant}"
+        if not path.exists():
+            path = self.directory / f"{key}-original"
+        data = path.read_bytes()
+        os.utime(self.directory / f"{key}.json", (entry.used, entry.used))
+        return data
+
+    def _store(self, key: str, data: bytes, entry: _Entry) -> None:
+        """Write art and its resized variants to disk."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{key}-original").write_bytes(data)
+        entry.size = len(data)
+        for variant, size in ART_VARIANTS.items():
+            path = self.directory / f"{key}-{variant}"
+            if resized := _resize(data, size):
+                path.write_bytes(resized)
+                entry.size += len(resized)
+            else:
+                path.unlink(missing_ok=True)
+        self._write_meta(key, entry)
+
+    def _write_meta(self, key: str, entry: _Entry) -> None:
+        """Write the metadata of cached art."""
+        meta = dataclasses.asdict(entry)
+        del meta["used"]
+        (self.directory / f"{key}.json").write_text(json.dumps(meta))
+
+    def _remove(self, keys: list[str]) -> None:
+        """Remove cached art from disk."""
+        for key in keys:
+            for path in self.directory.glob(f"{key}*"):
+                path.unlink(missing_ok=True)
+
+
+def _resize(data: bytes, size: int) -> bytes | None:
+    """Return the image scaled down to fit size, None if it can't be or already fits."""
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width <= size and image.height <= size:
+                return None
+            image_format = image.format or "JPEG"
+            image.thumbnail((size, size))
+            output = io.BytesIO()
+            image.save(output, format=image_format)
+            return output.getvalue()
+    except (OSError, ValueError) as err:
+        _LOGGER.debug("Failed to resize art: %r", err)
+        return None
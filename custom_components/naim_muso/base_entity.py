@@ -26,11 +26,15 @@ class BaseEntity(CoordinatorEntity):
     # ----------------------------------------------------------------------------
     _attr_has_entity_name = True
 
+    # MusoSnapshot fields this entity depends on, the entity is only
+    # updated when one of them changes. None means every update.
+    _coordinator_fields: frozenset[str] | None = None
+
     def __init__(
         self, coordinator: MusoCoordinator, parameter: str, translation_key: str = None
     ) -> None:
         """Initialise entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=self._coordinator_fields)
         self.udn = coordinator.udn
         self.device_type = coordinator.device_type
         # self._attr_name = coordinator.name
@@ -52,10 +56,22 @@ class BaseEntity(CoordinatorEntity):
         #     self.coordinator.get_device_parameter(
         #         self.device_id, "device_name"),
         # )
-        # This is probably wasteful as it will update all sensors on every update
-        # but it is simple and works for now.
+        # The coordinator only calls us when one of _coordinator_fields changed
         self.async_write_ha_state()
 
+    @property
+    def available(self) -> bool:
+        """Unavailable while not connected or no state of the device is known.
+
+        State restored from the warm start is shown, but the entity stays
+        unavailable until the device is connected.
+        """
+        return (
+            super().available
+            and self.coordinator.connected
+            and self.coordinator.data is not None
+        )
+
     @property
     def _device(self) -> Optional[NaimCo]:
         return self.coordinator._device
@@ -0,0 +1,158 @@
+"""Persisted catalog of the browse lists of a Mu-so."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.media_player import BrowseMedia, MediaClass, MediaType
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import BROWSE_CATALOG_MAX_ROWS, BROWSE_CATALOG_SAVE_DELAY, DOMAIN, LOGGER as _LOGGER
+
+BROWSE_CATALOG_STORAGE_VERSION = 1
+
+
+def browse_catalog_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the browse catalog of a config entry."""
+    return Store(
+        hass, BROWSE_CATALOG_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.browse_catalog"
+    )
+
+
+def _media_to_node(media: BrowseMedia, fetched: float) -> dict[str, Any]:
+    """Convert a page of a browse list to a compact catalog node."""
+    return {
+        "title": media.title,
+        "fetched": fetched,
+        "used": fetched,
+        # id, title, class, content type, can play, can expand, thumbnail
+        "children": [
+            [
+                child.media_content_id, child.title, child.media_class,
+                child.media_content_type, child.can_play, child.can_expand,
+                child.thumbnail,
+            ]
+            for child in media.children or []
+        ],
+    }
+
+
+def _node_to_media(content_id: str, node: dict[str, Any]) -> BrowseMedia:
+    """Convert a catalog node back to a page of a browse list."""
+    return BrowseMedia(
+        media_class=MediaClass.DIRECTORY,
+        media_content_id=content_id,
+        media_content_type=MediaType.CHANNELS,
+        title=node["title"],
+        can_play=False,
+        can_expand=True,
+        children=[
+            BrowseMedia(
+                media_content_id=child_id, title=title, media_class=media_class,
+                media_content_type=content_type, can_play=can_play,
+                can_expand=can_expand, thumbnail=thumbnail,
+            )
+            for child_id, title, media_class, content_type, can_play, can_expand, thumbnail
+            in node["children"]
+        ],
+    )
+
+
+def _parent_key(key: str) -> str | None:
+    """Return the key of the page a page is browsed to from, None for the top.
+
+    The parent of a later page is the first page of its list, e.g.
+    IRADIO|browse/3 for IRADIO|browse/3/p2 and IRADIO|browse/3/5.
+    """
+    input_id, _, content_id = key.partition("|")
+    parent, _, _ = content_id.rpartition("/")
+    return f"{input_id}|{parent}" if parent else None
+
+
+class BrowseCatalog:
+    """Browse list pages of every input, persisted across restarts.
+
+    Nodes are keyed by input and content id, e.g. IRADIO|browse/3/5, and
+    remember when they were fetched and last browsed. Once the catalog holds
+    more than BROWSE_CATALOG_MAX_ROWS rows the least recently browsed leaf
+    node is removed, lists are only removed after the lists below them and
+    later pages before the first one.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the catalog."""
+        self._store = browse_catalog_store(hass, entry_id)
+        self._nodes: dict[str, dict[str, Any]] | None = None
+        self._rows = 0
+
+    @property
+    def rows(self) -> int:
+        """Return the number of rows in the catalog."""
+        return self._rows
+
+    async def async_load(self) -> None:
+        """Load the catalog, once."""
+        if self._nodes is not None:
+            return
+        stored = await self._store.async_load() or {}
+        # Another load may have finished while waiting
+        if self._nodes is None:
+            self._nodes = stored.get("nodes", {})
+            self._rows = sum(len(node["children"]) for node in self._nodes.values())
+
+    @callback
+    def async_get(self, input_id: str, content_id: str) -> tuple[BrowseMedia, float] | None:
+        """Return a page and the time.time() it was fetched, if in the catalog."""
+        if not self._nodes or not (node := self._nodes.get(f"{input_id}|{content_id}")):
+            return None
+        node["used"] = time.time()
+        self._async_schedule_save()
+        return _node_to_media(content_id, node), node["fetched"]
+
+    @callback
+    def async_touch(self, input_id: str, content_id: str) -> None:
+        """Mark a page as browsed, when it was served from elsewhere."""
+        if self._nodes and (node := self._nodes.get(f"{input_id}|{content_id}")):
+            node["used"] = time.time()
+            self._async_schedule_save()
+
+    @callback
+    def async_put(self, input_id: str, media: BrowseMedia) -> None:
+        """Add or replace a page fetched from the device."""
+        if self._nodes is None:
+            return
+        key = f"{input_id}|{media.media_content_id}"
+        if old := self._nodes.pop(key, None):
+            self._rows -= len(old["children"])
+        node = _media_to_node(media, time.time())
+        self._nodes[key] = node
+        self._rows += len(node["children"])
+        while self._rows > BROWSE_CATALOG_MAX_ROWS and self._async_evict_leaf(key):
+            pass
+        self._async_schedule_save()
+
+    @callback
+    def _async_evict_leaf(self, keep: str) -> bool:
+        """Remove the least recently browsed node with no nodes below it.
+
+        Returns False if there is none but keep and the lists above it.
+        """
+        parents = {_parent_key(key) for key in self._nodes}
+        oldest = min(
+            (key for key in self._nodes if key != keep and key not in parents),
+            key=lambda key: self._nodes[key]["used"],
+            default=None,
+        )
+        if oldest is None:
+            return False
+        self._rows -= len(self._nodes.pop(oldest)["children"])
+        _LOGGER.debug("Evicted %s from the browse catalog", oldest)
+        return True
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Persist the catalog after a delay."""
+        self._store.async_delay_save(
+            lambda: {"nodes": self._nodes}, BROWSE_CATALOG_SAVE_DELAY
+        )
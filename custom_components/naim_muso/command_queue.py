@@ -0,0 +1,120 @@
+"""Latest-wins command queue for a Mu-so device."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import LOGGER as _LOGGER
+
+
+@dataclass
+class CommandStats:
+    """Statistics on the commands sent through the queue."""
+
+    # Commands requested by entities
+    requested: int = 0
+    # Commands that reached the device
+    sent: int = 0
+    # Commands replaced by a newer command of the same kind before being sent
+    coalesced: int = 0
+    failed: int = 0
+
+
+@dataclass
+class _PendingCommand:
+    """The most recent command of a kind waiting to be sent."""
+
+    send: Callable[[], Awaitable[None]]
+    waiters: list[asyncio.Future[None]] = field(default_factory=list)
+
+
+class CommandQueue:
+    """Send commands to the device, collapsing bursts of the same kind.
+
+    Only the most recent command of each kind (e.g. "volume") is kept while
+    waiting, and commands of a kind are sent at most once per min_interval.
+    Callers awaiting a command that got replaced are resolved when the command
+    replacing it has been sent, so a slider drag ends with a single round trip
+    for the final value. Commands of different kinds don't wait for each other.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, config_entry: ConfigEntry, min_interval: float
+    ) -> None:
+        """Initialize the command queue."""
+        self.hass = hass
+        self.config_entry = config_entry
+        self.min_interval = min_interval
+        self.stats = CommandStats()
+        self._pending: dict[str, _PendingCommand] = {}
+        self._workers: dict[str, asyncio.Task[None]] = {}
+        # time.monotonic() each kind of command was last sent
+        self._last_sent: dict[str, float] = {}
+
+    async def async_send(
+        self, kind: str, send: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Queue a command and wait until it, or a newer one of its kind, is sent.
+
+        Raises the exception of the send that covered this command, if any.
+        """
+        self.stats.requested += 1
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        if pending := self._pending.get(kind):
+            self.stats.coalesced += 1
+            pending.send = send
+            pending.waiters.append(future)
+        else:
+            self._pending[kind] = _PendingCommand(send, [future])
+        if kind not in self._workers:
+            self._workers[kind] = self.config_entry.async_create_background_task(
+                self.hass, self._async_worker(kind), name=f"naim_muso {kind} commands"
+            )
+        await future
+
+    async def _async_worker(self, kind: str) -> None:
+        """Send the pending commands of a kind until there are none left."""
+        try:
+            while pending := self._pending.get(kind):
+                if last_sent := self._last_sent.get(kind):
+                    delay = last_sent + self.min_interval - time.monotonic()
+                    if delay > 0:
+                        # Newer commands of this kind replace the pending one
+                        # while we wait
+                        await asyncio.sleep(delay)
+                        pending = self._pending[kind]
+                del self._pending[kind]
+                self._last_sent[kind] = time.monotonic()
+                try:
+                    await pending.send()
+                except asyncio.CancelledError:
+                    for waiter in pending.waiters:
+                        waiter.cancel()
+                    raise
+                except Exception as err:  # noqa: BLE001
+                    self.stats.failed += 1
+                    _LOGGER.debug("Sending %s command failed: %r", kind, err)
+                    for waiter in pending.waiters:
+                        if not waiter.done():
+                            waiter.set_exception(err)
+                    continue
+                self.stats.sent += 1
+                for waiter in pending.waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+        finally:
+            del self._workers[kind]
+
+    def async_cancel(self) -> None:
+        """Drop the pending commands and stop sending."""
+        for worker in self._workers.values():
+            worker.cancel()
+        for pending in self._pending.values():
+            for waiter in pending.waiters:
+                waiter.cancel()
+        self._pending.clear()
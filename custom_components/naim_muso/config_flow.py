@@ -2,13 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from pprint import pformat
 
 from typing import Any, cast
 from collections.abc import Mapping
-from functools import partial
-from ipaddress import IPv6Address, ip_address
 
 
 from urllib.parse import urlparse
@@ -16,7 +15,6 @@ from urllib.parse import urlparse
 from async_upnp_client.exceptions import UpnpError
 from async_upnp_client.profiles.dlna import DmrDevice
 from async_upnp_client.profiles.profile import find_device_of_type
-from getmac import get_mac_address
 
 
 from naimco import NaimCo
@@ -36,18 +34,25 @@ from homeassistant.const import (
     CONF_IP_ADDRESS,
 )
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import IntegrationError
-from homeassistant.helpers import device_registry as dr
 
 
 from .const import (
+    DEFAULT_BROWSE_PREFETCH,
+    DEFAULT_BROWSE_PREFETCH_BUDGET,
     DEFAULT_NAME,
+    DEFAULT_PUSH_COALESCE_WINDOW,
     DOMAIN,
+    CONF_BROWSE_PREFETCH,
+    CONF_BROWSE_PREFETCH_BUDGET,
     CONF_POLL_AVAILABILITY,
+    CONF_PUSH_COALESCE_WINDOW,
+    CONFIG_FLOW_PROBE_PARALLEL,
+    CONFIG_FLOW_PROBE_TIMEOUT,
 )
-from .data import get_domain_data
+from .data import discovery_bootid, get_domain_data
 
 LOGGER = logging.getLogger(__name__)
 
@@ -113,13 +118,13 @@ class NaimMusoFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         self._mac: str | None = None
         self._options: dict[str, Any] = {}
 
-    # @staticmethod
-    # @callback
-    # def async_get_options_flow(
-    #     config_entry: config_entries.ConfigEntry,
-    # ) -> config_entries.OptionsFlow:
-    #     """Define the config flow to handle options."""
-    #     return DlnaDmrOptionsFlowHandler(config_entry)
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Define the config flow to handle options."""
+        return NaimMusoOptionsFlowHandler()
 
     async def async_step_user(self, user_input: FlowInput = None) -> FlowResult:
         """Handle a flow initialized by the user.
@@ -138,7 +143,10 @@ class NaimMusoFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             await self._async_set_info_from_discovery(discovery)
             return self._create_entry()
 
-        if not (discoveries := await self._async_get_discoveries()):
+        discoveries = await self._async_probe_discoveries(
+            await self._async_get_discoveries()
+        )
+        if not discoveries:
             # Nothing found, maybe the user knows an URL to try
             return await self.async_step_manual()
 
@@ -283,8 +291,18 @@ class NaimMusoFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         assert self._location, "self._location has not been set before connect"
 
         domain_data = get_domain_data(self.hass)
+
+        async def _async_get_mac() -> str | None:
+            if self._mac or not (host := urlparse(self._location).hostname):
+                return self._mac
+            return await domain_data.mac_cache.async_get(host)
+
+        # The MAC address is looked up while the description is fetched
         try:
-            device = await domain_data.upnp_factory.async_create_device(self._location)
+            device, mac = await asyncio.gather(
+                domain_data.upnp_factory.async_create_device(self._location),
+                _async_get_mac(),
+            )
         except UpnpError as err:
             raise ConnectError("cannot_connect") from err
 
@@ -308,8 +326,7 @@ class NaimMusoFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         if not self._name:
             self._name = device.name
 
-        if not self._mac and (host := urlparse(self._location).hostname):
-            self._mac = await _async_get_mac_address(self.hass, host)
+        self._mac = mac
         # Maybe we should add validate input here?
         # await validate_input(self.hass, {"host": self._location})
 
@@ -356,7 +373,7 @@ class NaimMusoFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         if host := discovery_info.ssdp_headers.get("_host"):
-            self._mac = await _async_get_mac_address(self.hass, host)
+            self._mac = await get_domain_data(self.hass).mac_cache.async_get(host)
 
         if abort_if_configured:
             # Abort if already configured, but update the last-known location
@@ -366,6 +383,41 @@ class NaimMusoFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 updates[CONF_MAC] = self._mac
             self._abort_if_unique_id_configured(updates=updates, reload_on_update=False)
 
+    async def _async_probe_discoveries(
+        self, discoveries: list[ssdp.SsdpServiceInfo]
+    ) -> list[ssdp.SsdpServiceInfo]:
+        """Return the discovered Mu-so devices that respond.
+
+        Devices are probed at the same time, CONFIG_FLOW_PROBE_PARALLEL at
+        most, each fetching its description and looking up its MAC address
+        at once. Both are cached, so the device chosen is set up without
+        asking it again.
+        """
+        domain_data = get_domain_data(self.hass)
+        semaphore = asyncio.Semaphore(CONFIG_FLOW_PROBE_PARALLEL)
+
+        async def _async_probe(discovery: ssdp.SsdpServiceInfo) -> bool:
+            location = discovery.ssdp_location
+            host = discovery.ssdp_headers.get("_host") or urlparse(location).hostname
+            async with semaphore:
+                try:
+                    async with asyncio.timeout(CONFIG_FLOW_PROBE_TIMEOUT):
+                        await asyncio.gather(
+                            domain_data.async_get_device_description(
+                                location, discovery_bootid(discovery)
+                            ),
+                            domain_data.mac_cache.async_get(host),
+                        )
+                except (TimeoutError, UpnpError) as err:
+                    LOGGER.debug("Not listing %s, probing failed: %r", location, err)
+                    return False
+            return True
+
+        # Checking the discovery itself doesn't need the network
+        candidates = [disc for disc in discoveries if _is_muso_device(disc)]
+        responding = await asyncio.gather(*(_async_probe(disc) for disc in candidates))
+        return [disc for disc, ok in zip(candidates, responding) if ok]
+
     async def _async_get_discoveries(self) -> list[ssdp.SsdpServiceInfo]:
         """Get list of unconfigured DLNA devices discovered by SSDP."""
         LOGGER.debug("_get_discoveries")
@@ -390,6 +442,41 @@ class NaimMusoFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         return discoveries
 
 
+class NaimMusoOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle options for a naim Mu-so config entry."""
+
+    async def async_step_init(self, user_input: FlowInput = None) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            # Keep options set by the config flow, e.g. poll_availability
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **user_input}
+            )
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_PUSH_COALESCE_WINDOW,
+                    default=options.get(
+                        CONF_PUSH_COALESCE_WINDOW, DEFAULT_PUSH_COALESCE_WINDOW
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                vol.Optional(
+                    CONF_BROWSE_PREFETCH,
+                    default=options.get(CONF_BROWSE_PREFETCH, DEFAULT_BROWSE_PREFETCH),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10)),
+                vol.Optional(
+                    CONF_BROWSE_PREFETCH_BUDGET,
+                    default=options.get(
+                        CONF_BROWSE_PREFETCH_BUDGET, DEFAULT_BROWSE_PREFETCH_BUDGET
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=data_schema)
+
+
 def _is_ignored_device(discovery_info: ssdp.SsdpServiceInfo) -> bool:
     """Return True if this device should be ignored for discovery.
 
@@ -460,33 +547,3 @@ def _is_muso_device(discovery_info: ssdp.SsdpServiceInfo) -> bool:
         return False
 
     return True
-
-
-async def _async_get_mac_address(hass: HomeAssistant, host: str) -> str | None:
-    """Get mac address from host name, IPv4 address, or IPv6 address."""
-    # Help mypy, which has trouble with the async_add_executor_job + partial call
-    mac_address: str | None
-    # getmac has trouble using IPv6 addresses as the "hostname" parameter so
-    # assume host is an IP address, then handle the case it's not.
-    try:
-        ip_addr = ip_address(host)
-    except ValueError:
-        mac_address = await hass.async_add_executor_job(
-            partial(get_mac_address, hostname=host)
-        )
-    else:
-        if ip_addr.version == 4:
-            mac_address = await hass.async_add_executor_job(
-                partial(get_mac_address, ip=host)
-            )
-        else:
-            # Drop scope_id from IPv6 address by converting via int
-            ip_addr = IPv6Address(int(ip_addr))
-            mac_address = await hass.async_add_executor_job(
-                partial(get_mac_address, ip6=str(ip_addr))
-            )
-
-    if not mac_address:
-        return None
-
-    return dr.format_mac(mac_address)
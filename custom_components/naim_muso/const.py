@@ -1,5 +1,6 @@
 """Constants for the naim Mu-so controller integration."""
 import logging
+from datetime import timedelta
 from typing import Final
 
 LOGGER = logging.getLogger(__package__)
@@ -11,7 +12,110 @@ CONF_LISTEN_PORT: Final = "listen_port"
 CONF_CALLBACK_URL_OVERRIDE: Final = "callback_url_override"
 CONF_POLL_AVAILABILITY: Final = "poll_availability"
 CONF_BROWSE_UNFILTERED: Final = "browse_unfiltered"
+CONF_PUSH_COALESCE_WINDOW: Final = "push_coalesce_window"
+CONF_BROWSE_PREFETCH: Final = "browse_prefetch"
+CONF_BROWSE_PREFETCH_BUDGET: Final = "browse_prefetch_budget"
 
 DEFAULT_NAME: Final = "Naim Mu-so speaker"
+# Milliseconds to collect pushed updates before notifying entities, a track
+# change arrives as a burst of metadata, duration, art and buffer updates
+DEFAULT_PUSH_COALESCE_WINDOW: Final = 100
+# Child folders of a browse list read ahead in the background, 0 disables it
+DEFAULT_BROWSE_PREFETCH: Final = 0
+# Device round trips per minute prefetching may use
+DEFAULT_BROWSE_PREFETCH_BUDGET: Final = 30
 
 DATA_NAIM_MUSO_DISCOVERY_MANAGER = "naim_muso_discovery_manager"
+
+# Polling is only a safety net, state changes are pushed by the device. Poll
+# rarely while pushes are arriving or the device is in standby, and fall back
+# to regular polling when the pushes stop.
+POLL_INTERVAL_FALLBACK: Final = timedelta(seconds=10)
+POLL_INTERVAL_PUSH_ACTIVE: Final = timedelta(seconds=60)
+POLL_INTERVAL_STANDBY: Final = timedelta(seconds=120)
+# Devices polling their device at the same time, across all config entries.
+# Polls are spread over POLL_INTERVAL_FALLBACK, the other intervals are
+# multiples of it.
+POLL_MAX_IN_FLIGHT: Final = 4
+# Seconds since last push before the device is considered quiet
+PUSH_QUIET_PERIOD: Final = 30
+# Seconds after a poll during which state changes are taken as poll replies
+POLL_REPLY_GRACE: Final = 2
+
+# Seconds the reported media position may differ from the position extrapolated
+# from the last published one before it is published again
+MEDIA_POSITION_DRIFT_THRESHOLD: Final = 3
+
+# Minimum seconds between two commands of the same kind, e.g. volume, sent to
+# the device. Commands issued in between are collapsed into the latest one.
+COMMAND_MIN_INTERVAL: Final = 0.2
+
+# Seconds the device has to confirm a command before optimistic state is
+# rolled back
+OPTIMISTIC_CONFIRM_TIMEOUT: Final = 5
+
+# Devices probed at the same time when listing discovered devices to add, and
+# the seconds each has to respond
+CONFIG_FLOW_PROBE_PARALLEL: Final = 8
+CONFIG_FLOW_PROBE_TIMEOUT: Final = 3
+
+# Seconds each speaker has to take a group_control command
+GROUP_CONTROL_TIMEOUT: Final = 5
+# Seconds each speaker has to restore a snapshot, waking up takes a few
+RESTORE_TIMEOUT: Final = 15
+
+# Seconds a looked up MAC address is used before looking it up again, and
+# seconds to wait before trying again for a host without one
+MAC_CACHE_TTL: Final = 60 * 60
+MAC_CACHE_NEGATIVE_TTL: Final = 60
+
+# Seconds to wait before persisting the UPnP description cache
+DESCRIPTION_CACHE_SAVE_DELAY: Final = 10
+
+# Seconds between full refreshes of data that rarely changes, e.g. the inputs
+STATIC_REFRESH_INTERVAL: Final = 6 * 60 * 60
+# Seconds to wait before persisting changed warm start state
+WARM_START_SAVE_DELAY: Final = 30
+
+# Seconds browse lists are cached, by depth. Top level menus rarely change,
+# deeper lists like search results or stations do. The last entry is used for
+# all deeper lists.
+BROWSE_CACHE_TTLS: Final = (3600, 900, 300)
+# Seconds the device has to switch to browsing
+BROWSE_READY_TIMEOUT: Final = 10
+# Seconds without pushed view state before asking the device for it
+BROWSE_READY_POLL: Final = 1
+# Seconds without user activity before prefetching browse lists
+BROWSE_PREFETCH_IDLE: Final = 2
+# Rows of browse lists kept in the persisted catalog
+BROWSE_CATALOG_MAX_ROWS: Final = 20000
+# Seconds to wait before persisting the browse catalog
+BROWSE_CATALOG_SAVE_DELAY: Final = 60
+# Maximum number of media search results
+SEARCH_MAX_RESULTS: Final = 50
+# Rows fetched from the device per page of a browse list
+BROWSE_PAGE_SIZE: Final = 100
+# Pages of browse lists kept in the cache, least recently used are dropped
+BROWSE_CACHE_MAX_PAGES: Final = 50
+
+# Album art and station logos are cached on disk up to this many bytes
+ART_CACHE_MAX_BYTES: Final = 50 * 1024 * 1024
+# Seconds before cached art is revalidated with the server
+ART_REVALIDATE_AFTER: Final = 24 * 60 * 60
+ART_FETCH_TIMEOUT: Final = 10
+# Art URLs registered for the frontend to fetch, enough for every row of the
+# browse lists held in memory
+ART_REGISTERED_MAX: Final = BROWSE_CACHE_MAX_PAGES * BROWSE_PAGE_SIZE
+# Resized variants of art kept in the cache, name to maximum width and height
+ART_VARIANTS: Final = {"thumbnail": 300, "large": 1000}
+
+# Heartbeat timeout set on the device, it drops the connection if it doesn't
+# hear from us in this many seconds so naimco pings it before that
+HEARTBEAT_TIMEOUT: Final = 10
+# Seconds to wait for the TCP connection and API initialization
+CONNECT_TIMEOUT: Final = 10
+# Reconnect backoff in seconds, doubled on every failed attempt and jittered
+RECONNECT_BACKOFF_MIN: Final = 1
+RECONNECT_BACKOFF_MAX: Final = 120
+# Number of recovery times kept for diagnostics
+RECOVERY_HISTORY: Final = 20
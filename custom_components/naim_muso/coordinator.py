@@ -1,17 +1,26 @@
 
-from datetime import timedelta
-
 import asyncio
+import dataclasses
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import partial
+from typing import Any, NamedTuple
 from urllib.parse import urlparse
 from asyncio import Task
 from async_upnp_client.utils import async_get_local_ip
-from async_upnp_client.exceptions import UpnpError
 
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_DEVICE_ID, CONF_MAC, CONF_TYPE, CONF_URL
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.components import ssdp
+from homeassistant.components.media_player import MediaPlayerState
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
 
 from homeassistant.exceptions import HomeAssistantError
 
@@ -21,40 +30,131 @@ from homeassistant.helpers.update_coordinator import (
 )
 
 from naimco import NaimCo, NaimState
+from naimco.controllers import Controller
 
 from .const import (
-    LOGGER as _LOGGER, DOMAIN
+    LOGGER as _LOGGER, DOMAIN,
+    COMMAND_MIN_INTERVAL,
+    CONNECT_TIMEOUT,
+    HEARTBEAT_TIMEOUT,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_BACKOFF_MIN,
+    RECOVERY_HISTORY,
+    CONF_PUSH_COALESCE_WINDOW,
+    DEFAULT_PUSH_COALESCE_WINDOW,
+    MEDIA_POSITION_DRIFT_THRESHOLD,
+    OPTIMISTIC_CONFIRM_TIMEOUT,
+    POLL_INTERVAL_FALLBACK,
+    POLL_INTERVAL_PUSH_ACTIVE,
+    POLL_INTERVAL_STANDBY,
+    POLL_REPLY_GRACE,
+    PUSH_QUIET_PERIOD,
+    STATIC_REFRESH_INTERVAL,
+    WARM_START_SAVE_DELAY,
 )
-from .data import get_domain_data
-
-
-def catch_comm_error(func):
-    async def wrapper(*args, **kwargs):
-        self = args[0]
-        if not isinstance(self, MusoCoordinator):
-            raise HomeAssistantError(
-                "Illegal use of decorator, 'self' is not instance of NaimMediaPlayer")
-        if self._tasks and self._tasks.done():
-            # await self._device_disconnect()
-
-            ex = self._tasks.exception()
-            self._tasks = None
-            if ex:
-                raise HomeAssistantError(ex)
-            raise HomeAssistantError("Runner task finished, disconnecting")
-        if not self._device:
-            _LOGGER.info("trying to reconnect!")
-            try:
-                await self._device_connect(self.location)
-            except UpnpError as err:
-                _LOGGER.debug("Couldn't connect immediately: %r", err)
-        try:
-            return await func(*args, **kwargs)
-        except Exception as ex:
-            _LOGGER.warning(
-                f"{func.__name__} failed to communuicate with Mu-so {ex}\n")
-            raise
-    return wrapper
+from .command_queue import CommandQueue
+from .data import discovery_bootid, get_domain_data
+from .device_scene import DeviceScene
+from .media_browser import MusoBrowser
+from .snapshot import MusoSnapshot, build_snapshot
+from .warm_start import seed_state, warm_start_data, warm_start_store
+
+
+class TierQuery(NamedTuple):
+    """A query sent to the device as part of a refresh tier."""
+
+    command: str
+    wait_for_reply_timeout: float | None = None
+    # NVM commands are tunneled, the others are sent as XML commands
+    nvm: bool = True
+    # Between full refreshes of the tier, send the query while this returns
+    # True, e.g. the data is missing
+    missing: Callable[[NaimState], bool] | None = None
+
+
+class RefreshTier(NamedTuple):
+    """Group of device queries that are refreshed on the same schedule."""
+
+    name: str
+    # Seconds between full refreshes, 0 for every poll
+    interval: float
+    # Skip while the device pushes updates for this data
+    push_driven: bool
+    # Query while the device is in standby
+    in_standby: bool
+    queries: tuple[TierQuery, ...]
+
+
+# Replaces naimco's request_data_update, so each poll only sends the queries
+# that are due instead of all of them.
+REFRESH_TIERS: tuple[RefreshTier, ...] = (
+    RefreshTier("playback", 0, True, True, (
+        TierQuery("GetViewState", nvm=False),
+        TierQuery("GETVIEWSTATE"),
+        TierQuery("GETPREAMP"),
+        TierQuery("GETBRIEFNP"),
+        TierQuery("GETSTANDBYSTATUS", 0.5),
+    )),
+    RefreshTier("now_playing", 10, True, False, (
+        TierQuery("GetNowPlaying", nvm=False),
+    )),
+    RefreshTier("diagnostics", 300, False, False, (
+        TierQuery("GETTEMP"),
+        TierQuery("GETPSU", 0.5),
+    )),
+    RefreshTier("static", STATIC_REFRESH_INTERVAL, False, True, (
+        TierQuery("GETINPUTBLK", 0.5, missing=lambda state: not state.inputblk),
+        TierQuery("PRODUCT", missing=lambda state: not state.product),
+        TierQuery("GETSERIALNUM", missing=lambda state: not state.serialnum),
+        TierQuery("GETROOMNAME", 0.5, missing=lambda state: not state.roomname),
+        # Presets are requested by naimco once it knows how many there are
+        TierQuery("GETTOTALPRESETS", 0.5, missing=lambda state: not state.presetblk),
+        TierQuery("GETILLUM", 0.5, missing=lambda state: state.illum is None),
+    )),
+)
+
+
+@dataclass
+class PushStats:
+    """Statistics on coalesced device pushes, used to tune the window."""
+
+    bursts: int = 0
+    callbacks: int = 0
+    # Seconds from the first push of a burst until entities were notified
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+    avg_latency: float = 0.0
+
+    def record(self, callbacks: int, latency: float) -> None:
+        """Record a dispatched burst."""
+        self.bursts += 1
+        self.callbacks += callbacks
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self.avg_latency += (latency - self.avg_latency) / self.bursts
+
+
+@dataclass
+class ConnectionStats:
+    """Statistics on the connection to the device."""
+
+    connects: int = 0
+    disconnects: int = 0
+    failed_attempts: int = 0
+    last_error: str | None = None
+    # Seconds from losing the connection until it was back up, oldest first
+    recovery_times: list[float] = field(default_factory=list)
+
+
+@dataclass
+class OptimisticStats:
+    """Statistics on optimistic state applied for commands."""
+
+    applied: int = 0
+    confirmed: int = 0
+    # Not confirmed by the device in time, or the command failed
+    rolled_back: int = 0
+    last_mismatch: str | None = None
 
 
 class MusoCoordinator(DataUpdateCoordinator):
@@ -86,6 +186,23 @@ class MusoCoordinator(DataUpdateCoordinator):
 
     _tasks: Task | None = None
 
+    # time.monotonic() of the last state pushed by the device
+    _last_push: float | None = None
+    # Replies to our own queries are not pushes, ignore state changes until
+    # this time.monotonic() when accounting for pushes
+    _poll_replies_until: float = 0
+
+    # Snapshot and availability at the last listener dispatch
+    _dispatched_data: MusoSnapshot | None = None
+    _dispatched_available: bool | None = None
+
+    data: MusoSnapshot | None
+
+    # Pushes received since the last dispatch, see devices_update_callback
+    _push_pending_since: float | None = None
+    _push_pending_count: int = 0
+    _push_flush_unsub: CALLBACK_TYPE | None = None
+
     # def __init__(self, device: NaimCo) -> None:
     #     """Store the naimco device used to control naim device."""
     #     self._device = device
@@ -95,15 +212,16 @@ class MusoCoordinator(DataUpdateCoordinator):
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             # Name of the data. For logging purposes.
             name=config_entry.title,
             # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(seconds=10),
+            # Adjusted after every push and poll, see _async_adjust_update_interval
+            update_interval=POLL_INTERVAL_FALLBACK,
             # update_method=self._async_update_data,
-            # Set always_update to `False` if the data returned from the
-            # api can be compared via `__eq__` to avoid duplicate updates
-            # being dispatched to listeners
-            always_update=True
+            # Snapshots compare equal when nothing changed, listeners are
+            # then not called at all
+            always_update=False
         )
         """Initialize DLNA DMR entity."""
         self.udn = config_entry.data[CONF_DEVICE_ID],
@@ -113,27 +231,73 @@ class MusoCoordinator(DataUpdateCoordinator):
         # self.poll_availability = poll_availability
         self.location = config_entry.data[CONF_URL]
         self.mac_address = config_entry.data[CONF_MAC]
+        domain_data = get_domain_data(hass)
+        # Discoveries of this device then don't have to look up its address
+        if host := urlparse(self.location).hostname:
+            domain_data.mac_cache.async_seed(host, self.mac_address)
+        self._push_window = config_entry.options.get(
+            CONF_PUSH_COALESCE_WINDOW, DEFAULT_PUSH_COALESCE_WINDOW
+        ) / 1000
+        self.push_stats = PushStats()
+        self.connection_stats = ConnectionStats()
+        # Slider commands (volume, illumination) go through this queue
+        self.commands = CommandQueue(hass, config_entry, COMMAND_MIN_INTERVAL)
+        # Snapshot field to the value we expect the device to report after a
+        # command, and the cancel callback of its confirmation deadline
+        self._optimistic: dict[str, tuple[Any, CALLBACK_TYPE]] = {}
+        self.optimistic_stats = OptimisticStats()
+        self.browser = MusoBrowser(self)
+        # Settings saved by the snapshot service, put back by restore
+        self.scene: DeviceScene | None = None
+        # Spreads the polls of all devices, see _async_adjust_update_interval
+        self._poll_scheduler = domain_data.poll_scheduler
+        self._poll_interval = POLL_INTERVAL_FALLBACK
+        # True from connecting to the device until the connection is lost
+        self._connection_up = False
+        # time.monotonic() when the connection was lost
+        self._disconnected_at: float | None = None
+        # time.monotonic() each refresh tier was last fully queried
+        self._tier_refreshed: dict[str, float] = {}
+        self._warm_start_store = warm_start_store(hass, config_entry.entry_id)
+        # Loaded before the first connect, seeds the state of the device
+        self._warm_start: dict[str, Any] | None = None
+        # time.time() of the last full refresh of the static tier, persisted
+        # with the warm start state
+        self._static_refreshed_at: float | None = None
         # self.browse_unfiltered = browse_unfiltered
         self._device_lock = asyncio.Lock()
 
-    async def _async_setup(self):
-        """Set up the coordinator
-
-        This is the place to set up your coordinator,
-        or to load data, that only needs to be loaded once.
+    @callback
+    def async_start(self) -> None:
+        """Connect to the device in the background.
 
-        This method will be called automatically during
-        coordinator.async_config_entry_first_refresh.
+        Setup of the config entry doesn't wait for the device, which may be
+        asleep or offline. Entities are unavailable until the first state
+        arrives, the connection supervisor refreshes once connected.
         """
+        self._poll_scheduler.async_register(self.config_entry.entry_id)
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_background_connect(), name=f"{DOMAIN} {self.name} connect"
+        )
 
-        # Try to connect to the last known location, but don't worry if not available
-        if not self._device:
+    async def _async_background_connect(self) -> None:
+        """Keep trying to connect to the last known location until it works."""
+        await self._async_load_warm_start()
+        backoff = RECONNECT_BACKOFF_MIN
+        while not self._device:
             try:
                 await self._device_connect(self.location)
-            except UpnpError as err:
-                _LOGGER.debug("Couldn't connect immediately: %r", err)
+            except Exception as err:
+                self.connection_stats.failed_attempts += 1
+                self.connection_stats.last_error = repr(err)
+                delay = random.uniform(backoff / 2, backoff)
+                _LOGGER.debug(
+                    "Couldn't connect to %s: %r, retrying in %.1f s",
+                    self.location, err, delay,
+                )
+                await asyncio.sleep(delay)
+                backoff = min(backoff * 2, RECONNECT_BACKOFF_MAX)
 
-    # @catch_comm_error
     async def _async_update_data(self):
         """Fetch data from API endpoint.
 
@@ -155,22 +319,438 @@ class MusoCoordinator(DataUpdateCoordinator):
         #     raise ConfigEntryAuthFailed from err
         # except ApiError as err:
         #     raise UpdateFailed(f"Error communicating with API: {err}")
-        _LOGGER.debug("Coordinator Updating data")
+        if not self._device or not self._device.controller:
+            raise UpdateFailed("Not connected to Mu-so")
+        now = time.monotonic()
+        due = [tier for tier in REFRESH_TIERS if self._tier_due(tier, now)]
+        _LOGGER.debug("Coordinator Updating data, tiers: %s", [t.name for t in due])
+        if due:
+            self._poll_replies_until = float("inf")
         try:
-            await self._device.update_data()
+            if due:
+                async with self._poll_scheduler.async_poll(self.config_entry.entry_id):
+                    for tier in due:
+                        full = self._tier_elapsed(tier, now)
+                        await self._async_query_tier(tier, full)
+                        if full:
+                            self._tier_refreshed[tier.name] = now
+                            if tier.name == "static":
+                                self._static_refreshed_at = time.time()
         except Exception as e:
             _LOGGER.debug("Error updating data: %r", e)
             raise UpdateFailed(f"Error communicating with Mu-so: {e}")
-        # await asyncio.sleep(0.1)
-        return self._device.state
+        finally:
+            if due:
+                # Most queries don't wait for the reply, give them a moment
+                self._poll_replies_until = time.monotonic() + POLL_REPLY_GRACE
+        self._async_adjust_update_interval()
+        return self._async_build_snapshot()
+
+    @callback
+    def _async_build_snapshot(self) -> MusoSnapshot:
+        """Build a snapshot of the device state.
+
+        Returns the current snapshot if nothing changed, so it can be compared
+        by identity as well as by value.
+        """
+        version = self.data.version if self.data else 0
+        snapshot = self._anchor_media_position(build_snapshot(self._device, version))
+        snapshot = self._apply_optimistic(snapshot)
+        if snapshot == self.data:
+            return self.data
+        self._async_schedule_warm_start_save()
+        return dataclasses.replace(snapshot, version=version + 1)
+
+    @callback
+    def _async_schedule_warm_start_save(self) -> None:
+        """Persist the warm start state if it changed since it was loaded or saved."""
+        data = {
+            **warm_start_data(self._device.state),
+            "static_refreshed_at": self._static_refreshed_at,
+        }
+        if data != self._warm_start:
+            self._warm_start = data
+            self._warm_start_store.async_delay_save(
+                lambda: data, WARM_START_SAVE_DELAY
+            )
+
+    async def _async_load_warm_start(self) -> None:
+        """Load the state persisted before the last restart."""
+        self._warm_start = await self._warm_start_store.async_load()
+        if self._warm_start:
+            self._static_refreshed_at = self._warm_start.get("static_refreshed_at")
+
+    @callback
+    def _async_seed_device(self) -> None:
+        """Seed the state of a new device with the warm start state.
+
+        Entities and the media browser get the inputs, presets and last
+        played media right away, and the static tier is only queried once its
+        persisted data is due.
+        """
+        if not self._warm_start:
+            return
+        seed_state(self._device.state, self._warm_start)
+        if self._static_refreshed_at:
+            age = max(time.time() - self._static_refreshed_at, 0)
+            self._tier_refreshed["static"] = time.monotonic() - age
+        # Not an update from the device, the entities stay unavailable until
+        # the connection is up but show the inputs and presets already
+        self.data = self._async_build_snapshot()
+        self.async_update_listeners()
+
+    def _apply_optimistic(self, snapshot: MusoSnapshot) -> MusoSnapshot:
+        """Overlay the optimistic values the device has not confirmed yet.
+
+        Values the device now reports are confirmed and dropped from the
+        overlay.
+        """
+        if not self._optimistic:
+            return snapshot
+        overlay = {}
+        for name, (value, cancel_deadline) in list(self._optimistic.items()):
+            if getattr(snapshot, name) == value:
+                cancel_deadline()
+                del self._optimistic[name]
+                self.optimistic_stats.confirmed += 1
+            else:
+                overlay[name] = value
+        return dataclasses.replace(snapshot, **overlay) if overlay else snapshot
+
+    def _anchor_media_position(self, snapshot: MusoSnapshot) -> MusoSnapshot:
+        """Only move the published media position on playback transitions.
+
+        The device reports the position every second, but the frontend can
+        extrapolate it from media_position_updated_at while playing. Keep the
+        previous position and timestamp unless playback started or stopped,
+        the track changed, or the reported position drifted away from the
+        extrapolated one, e.g. after a seek.
+        """
+        previous = self.data
+        position = snapshot.media_position
+        if position is None:
+            return snapshot
+        now = dt_util.utcnow()
+        if (
+            previous is not None
+            and previous.media_position is not None
+            and previous.media_position_updated_at is not None
+            and previous.player_state == snapshot.player_state
+            and previous.media_title == snapshot.media_title
+            and previous.media_duration == snapshot.media_duration
+            and previous.media_content_type == snapshot.media_content_type
+        ):
+            expected = previous.media_position
+            if snapshot.player_state == MediaPlayerState.PLAYING:
+                expected += (now - previous.media_position_updated_at).total_seconds()
+            if abs(position - expected) <= MEDIA_POSITION_DRIFT_THRESHOLD:
+                return dataclasses.replace(
+                    snapshot,
+                    media_position=previous.media_position,
+                    media_position_updated_at=previous.media_position_updated_at,
+                )
+        return dataclasses.replace(snapshot, media_position_updated_at=now)
+
+    def _tier_elapsed(self, tier: RefreshTier, now: float) -> bool:
+        """Return True if a full refresh of a tier is due."""
+        last = self._tier_refreshed.get(tier.name)
+        return last is None or now - last >= tier.interval
+
+    def _tier_due(self, tier: RefreshTier, now: float) -> bool:
+        """Return True if the queries of a refresh tier should be sent now."""
+        if tier.name not in self._tier_refreshed:
+            # Never queried, get everything
+            return True
+        if tier.push_driven and self._pushes_active:
+            return False
+        if not tier.in_standby and self._in_standby:
+            return False
+        return self._tier_elapsed(tier, now) or any(
+            query.missing(self._device.state) for query in tier.queries
+            if query.missing
+        )
+
+    async def _async_query_tier(self, tier: RefreshTier, full: bool) -> None:
+        """Send the queries of a refresh tier to the device.
+
+        Unless it is a full refresh only the queries for missing data are sent.
+        """
+        controller = self._device.controller
+        for query in tier.queries:
+            if not full and not (query.missing and query.missing(self._device.state)):
+                continue
+            if query.nvm:
+                await controller.nvm.send_command(
+                    query.command, wait_for_reply_timeout=query.wait_for_reply_timeout
+                )
+            else:
+                await controller.send_command(
+                    query.command, wait_for_reply_timeout=query.wait_for_reply_timeout
+                )
+
+    @property
+    def _pushes_active(self) -> bool:
+        """Return True if the device has pushed state recently."""
+        return (
+            self._last_push is not None
+            and time.monotonic() - self._last_push < PUSH_QUIET_PERIOD
+        )
+
+    @property
+    def _in_standby(self) -> bool:
+        """Return True if the device reports being in standby."""
+        if not self._device or not self._device.standbystatus:
+            return False
+        return self._device.standbystatus.get("state") == "ON"
+
+    @callback
+    def _async_adjust_update_interval(self) -> None:
+        """Pick the polling interval based on push activity and standby state.
+
+        The new interval takes effect when the coordinator schedules the next
+        refresh, which happens after every poll and every pushed update. It is
+        stretched or shortened a little so the poll lands on the slot the
+        domain poll scheduler picked for this device.
+        """
+        if self._in_standby:
+            interval = POLL_INTERVAL_STANDBY
+        elif self._pushes_active:
+            interval = POLL_INTERVAL_PUSH_ACTIVE
+        else:
+            interval = POLL_INTERVAL_FALLBACK
+        if interval != self._poll_interval:
+            _LOGGER.debug("Polling %s every %s", self.name, interval)
+            self._poll_interval = interval
+        delay = self._poll_scheduler.next_delay(
+            self.config_entry.entry_id, interval.total_seconds()
+        )
+        # The coordinator schedules from the loop time rounded down to the
+        # second plus its own fixed fraction of a second, _microsecond, both
+        # are taken back out so the poll lands on the slot
+        self.update_interval = timedelta(
+            seconds=delay + self.hass.loop.time() % 1 - self._microsecond
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the listeners subscribed to snapshot fields that changed.
+
+        Listeners pass the set of MusoSnapshot fields they depend on as context,
+        those without context are always notified. All listeners are notified
+        when availability changes.
+        """
+        previous = self._dispatched_data
+        self._dispatched_data = self.data
+        available = self.last_update_success and self.connected
+        availability_changed = self._dispatched_available != available
+        self._dispatched_available = available
+        if previous is None or self.data is None:
+            changed = None
+        else:
+            changed = {
+                f.name for f in dataclasses.fields(MusoSnapshot)
+                if f.compare and getattr(previous, f.name) != getattr(self.data, f.name)
+            }
+            if not changed and not availability_changed:
+                return
+            if "source" in changed:
+                # Each input has its own lists to browse
+                self.browser.async_input_changed()
+        _LOGGER.debug("Snapshot fields changed: %s", changed)
+
+        for update_callback, context in list(self._listeners.values()):
+            if (
+                availability_changed or changed is None or context is None
+                or not changed.isdisjoint(context)
+            ):
+                update_callback()
 
     async def async_shutdown(self) -> None:
         """Run shutdown clean up."""
         _LOGGER.debug("Shutting down coordinator")
+        if self._push_flush_unsub:
+            self._push_flush_unsub()
+            self._push_flush_unsub = None
+        for _, cancel_deadline in self._optimistic.values():
+            cancel_deadline()
+        self._optimistic.clear()
+        self.commands.async_cancel()
+        self._poll_scheduler.async_unregister(self.config_entry.entry_id)
         await super().async_shutdown()
         await self._device_disconnect()
         # await self.disconnect_api()
 
+    @property
+    def connected(self) -> bool:
+        """Return True if the connection to the device is up."""
+        return (
+            self._connection_up
+            and self._device is not None
+            and self._device.controller is not None
+        )
+
+    async def _async_command(self, send: Callable[[], Awaitable[None]]) -> None:
+        """Send a command of the user to the device.
+
+        Every command goes through here, prefetching browse lists stops so it
+        doesn't compete with the user for the device.
+        """
+        self.browser.async_pause_prefetch()
+        await send()
+
+    async def async_turn_on(self) -> None:
+        """Bring the device out of standby."""
+        await self._async_command(self._device.on)
+
+    async def async_turn_off(self) -> None:
+        """Put the device in standby."""
+        await self._async_command(self._device.off)
+
+    async def async_media_play(self) -> None:
+        """Start or resume playing."""
+        await self._async_command(self._device.play)
+
+    async def async_media_pause(self) -> None:
+        """Pause playing."""
+        await self._async_command(self._device.pause)
+
+    async def async_media_stop(self) -> None:
+        """Stop playing."""
+        await self._async_command(self._device.stop)
+
+    async def async_media_next_track(self) -> None:
+        """Skip to the next track."""
+        await self._async_command(self._device.nexttrack)
+
+    async def async_media_previous_track(self) -> None:
+        """Go back to the previous track."""
+        await self._async_command(self._device.prevtrack)
+
+    async def async_volume_up(self) -> None:
+        """Turn the volume up a step."""
+        await self._async_command(self._device.volume_up)
+
+    async def async_volume_down(self) -> None:
+        """Turn the volume down a step."""
+        await self._async_command(self._device.volume_down)
+
+    async def async_select_preset(self, preset: int) -> None:
+        """Play an iRadio preset by its index."""
+        await self._async_command(partial(self._device.select_preset, preset))
+
+    async def async_select_source(self, source: str) -> None:
+        """Select an input by its name."""
+        inputs = self.data.inputs if self.data else {}
+        for index, name in inputs.items():
+            if name == source:
+                await self.async_select_input(index)
+                return
+        raise HomeAssistantError(f"Unknown source {source} on {self.name}")
+
+    async def async_set_volume_level(self, volume: float) -> None:
+        """Set the volume level, range 0..1."""
+        level = int(100 * volume)
+        await self._async_optimistic_command(
+            {"volume_level": level / 100.0},
+            partial(
+                self.commands.async_send,
+                "volume", partial(self._device.set_volume, level),
+            ),
+        )
+
+    async def async_mute_volume(self, mute: bool) -> None:
+        """Mute or unmute the volume."""
+        await self._async_optimistic_command(
+            {"is_volume_muted": mute}, partial(self._device.mute, mute)
+        )
+
+    async def async_select_input(self, index: str) -> None:
+        """Select an input by its id."""
+        source = self.data.inputs.get(index) if self.data else None
+        # Only show the input selected if we know its name
+        await self._async_optimistic_command(
+            {"source": source} if source else {},
+            partial(self._device.select_input, index),
+        )
+
+    async def async_set_illum(self, illum: int) -> None:
+        """Set the illumination level, 0 is off."""
+        await self._async_optimistic_command(
+            {"illum": illum},
+            partial(
+                self.commands.async_send,
+                "illum", partial(self._device.set_illum, illum),
+            ),
+        )
+
+    async def async_set_cleaningmode(self, cleaningmode: bool) -> None:
+        """Turn cleaning mode on or off.
+
+        Not optimistic, naimco doesn't read cleaning mode back from the device
+        so it would never be confirmed.
+        """
+        await self._async_command(partial(self._device.set_cleaningmode, cleaningmode))
+
+    async def _async_optimistic_command(
+        self, values: dict[str, Any], send: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Publish the expected state right away, then send the command.
+
+        The device has OPTIMISTIC_CONFIRM_TIMEOUT seconds to report the
+        values, otherwise they are rolled back. A failing command is rolled
+        back immediately.
+        """
+        for name, value in values.items():
+            if name in self._optimistic:
+                self._optimistic.pop(name)[1]()
+            self._optimistic[name] = (
+                value,
+                async_call_later(
+                    self.hass,
+                    OPTIMISTIC_CONFIRM_TIMEOUT,
+                    partial(self._async_optimistic_deadline, name),
+                ),
+            )
+            self.optimistic_stats.applied += 1
+        self._async_publish_snapshot()
+        try:
+            await self._async_command(send)
+        except Exception as err:
+            for name, value in values.items():
+                if self._optimistic.get(name, (None,))[0] == value:
+                    self._async_roll_back(name, f"command failed: {err!r}")
+            self._async_publish_snapshot()
+            raise
+
+    @callback
+    def _async_optimistic_deadline(self, name: str, _now: Any) -> None:
+        """Roll back an optimistic value the device did not confirm in time."""
+        if name not in self._optimistic:
+            return
+        self._async_roll_back(name, "not confirmed by the device in time")
+        self._async_publish_snapshot()
+
+    @callback
+    def _async_roll_back(self, name: str, reason: str) -> None:
+        """Drop an optimistic value so the device state shows again."""
+        value, cancel_deadline = self._optimistic.pop(name)
+        cancel_deadline()
+        self.optimistic_stats.rolled_back += 1
+        self.optimistic_stats.last_mismatch = f"{name}: expected {value!r}, {reason}"
+        _LOGGER.warning(
+            "Rolling back %s of %s to the device state, expected %r: %s",
+            name, self.name, value, reason,
+        )
+
+    @callback
+    def _async_publish_snapshot(self) -> None:
+        """Publish a snapshot of the current device state and overlay."""
+        if not self._device:
+            return
+        snapshot = self._async_build_snapshot()
+        if snapshot is not self.data:
+            self.async_set_updated_data(snapshot)
+
     @property
     def unique_id(self) -> str:
         """Report the UDN (Unique Device Name) as this entity's unique ID."""
@@ -190,7 +770,7 @@ class MusoCoordinator(DataUpdateCoordinator):
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device info."""
-        _LOGGER.debug("device_info serialnum: %s", self._device.serialnum)
+        # Called when entities are added, possibly before the device connected
         return DeviceInfo(
             identifiers={
                 # Serial numbers are unique identifiers within a specific domain
@@ -217,11 +797,13 @@ class MusoCoordinator(DataUpdateCoordinator):
             domain_data = get_domain_data(self.hass)
             _LOGGER.debug(f"domain_data {domain_data}")
 
-            # Connect to the base UPNP device
-            upnp_device = await domain_data.upnp_factory.async_create_device(location)
-            _LOGGER.debug(f"upnp_device {upnp_device}")
-            _LOGGER.debug(f"upnp_device {upnp_device.device_info.url}")
-            hostname = urlparse(upnp_device.device_info.url).hostname
+            # Only the hostname is needed from the UPNP device description,
+            # reuse the cached one unless the device rebooted since
+            self._bootid = self._async_get_bootid()
+            description = await domain_data.async_get_device_description(
+                location, self._bootid
+            )
+            hostname = description.hostname
             _LOGGER.debug(f"hostname {hostname}")
 
             # # Create/get event handler that is reachable by the device, using
@@ -238,9 +820,15 @@ class MusoCoordinator(DataUpdateCoordinator):
             _LOGGER.debug(f"location {location} ip_address {ip_address}")
             self._device = NaimCo(hostname, self.devices_update_callback)
             self.location = location
-            await self._device.startup(timeout=10)
-            # Using the hass async_create_task will hang,
-            # self.hass.async_create_task(self._device.runner_task())
+            self._async_seed_device()
+            # We supervise the connection instead of naimco's startup() so we
+            # learn about a lost connection immediately.
+            # Using the hass async_create_task will hang, it is not a background task
+            self._tasks = self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_connection_supervisor(self._device),
+                name=f"{DOMAIN} {self.name} connection",
+            )
 
             # await self._device.controller.send_command("GetViewState")
             # await self._device.controller.nvm.send_command("GETVIEWSTATE")
@@ -251,6 +839,15 @@ class MusoCoordinator(DataUpdateCoordinator):
             # await self._device.controller.nvm.send_command("GETROOMNAME")
             # await self._device.controller.nvm.send_command("GETSERIALNUM")
 
+    @callback
+    def _async_get_bootid(self) -> int | None:
+        """Return the BOOTID the device currently advertises over SSDP, if seen."""
+        udn = self.config_entry.data[CONF_DEVICE_ID]
+        for discovery in ssdp.async_get_discovery_info_by_udn(self.hass, udn):
+            if bootid := discovery_bootid(discovery):
+                return bootid
+        return None
+
     async def _device_disconnect(self) -> None:
         """Destroy connections to the device now that it's not available.
 
@@ -260,6 +857,10 @@ class MusoCoordinator(DataUpdateCoordinator):
             if self._tasks:
                 _LOGGER.debug("Cancelling tasks")
                 self._tasks.cancel()
+                try:
+                    await self._tasks
+                except asyncio.CancelledError:
+                    pass
                 self._tasks = None
 
             if not self._device:
@@ -271,14 +872,136 @@ class MusoCoordinator(DataUpdateCoordinator):
             old_device = self._device
             self._device = None
             # await old_device.async_unsubscribe_services()
-            await old_device.shutdown()
+            await self._async_close_controller(old_device)
 
         # domain_data = get_domain_data(self.hass)
         # await domain_data.async_release_event_notifier(self._event_addr)
 
+    async def _async_connection_supervisor(self, device: NaimCo) -> None:
+        """Keep the connection to the device up.
+
+        Replaces naimco's own reconnect loop. The reader task fails as soon
+        as the socket drops, which makes the entities unavailable right away
+        and starts reconnecting with exponential backoff. The backoff is
+        jittered so many speakers don't reconnect in lockstep after a network
+        blip.
+        """
+        backoff = RECONNECT_BACKOFF_MIN
+        while True:
+            device.controller = Controller(device)
+            try:
+                async with asyncio.timeout(CONNECT_TIMEOUT):
+                    await device.controller.connect()
+                    await device.initialize(HEARTBEAT_TIMEOUT)
+            except Exception as err:
+                self.connection_stats.failed_attempts += 1
+                if self._disconnected_at is None:
+                    # Down since the supervisor started, or the first attempt
+                    # after the connection dropped
+                    self._async_connection_lost(err)
+                self.connection_stats.last_error = repr(err)
+                await self._async_close_controller(device)
+                delay = random.uniform(backoff / 2, backoff)
+                _LOGGER.debug(
+                    "Connecting to %s failed: %r, retrying in %.1f s",
+                    self.name, err, delay,
+                )
+                await asyncio.sleep(delay)
+                backoff = min(backoff * 2, RECONNECT_BACKOFF_MAX)
+                continue
+
+            backoff = RECONNECT_BACKOFF_MIN
+            self._async_connection_up()
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(device.runner_task())
+                    tg.create_task(device.controller.keep_alive(HEARTBEAT_TIMEOUT))
+                    tg.create_task(self.async_refresh())
+            except* Exception as eg:
+                self._async_connection_lost(eg.exceptions[0])
+            await self._async_close_controller(device)
+
+    @callback
+    def _async_connection_up(self) -> None:
+        """Record that the connection to the device is up."""
+        self.connection_stats.connects += 1
+        self._connection_up = True
+        if self._disconnected_at is not None:
+            recovery_time = time.monotonic() - self._disconnected_at
+            self._disconnected_at = None
+            recovery_times = self.connection_stats.recovery_times
+            recovery_times.append(round(recovery_time, 3))
+            del recovery_times[:-RECOVERY_HISTORY]
+            _LOGGER.info("Reconnected to %s after %.1f s", self.name, recovery_time)
+        # The first refresh may not change the snapshot, availability does
+        self.async_update_listeners()
+
+    @callback
+    def _async_connection_lost(self, err: Exception) -> None:
+        """Record that the connection to the device was lost."""
+        self.connection_stats.disconnects += 1
+        self._connection_up = False
+        self.connection_stats.last_error = repr(err)
+        self._disconnected_at = time.monotonic()
+        self.async_set_update_error(UpdateFailed(f"Connection to Mu-so lost: {err!r}"))
+
+    async def _async_close_controller(self, device: NaimCo) -> None:
+        """Close the connection of the device's controller, if any."""
+        controller = device.controller
+        device.controller = None
+        self._connection_up = False
+        if controller and controller.connection:
+            try:
+                await controller.shutdown()
+            except Exception as err:
+                _LOGGER.debug("Failed to close connection: %r", err)
+
     async def devices_update_callback(self, state: NaimState):
-        """Receive callback from api with device update."""
-        self.async_set_updated_data(state)
+        """Receive callback from api with device update.
+
+        The device sends bursts of updates, e.g. metadata, duration, art and
+        buffer state on a track change. Collect them for _push_window seconds
+        and notify the entities once.
+        """
+        # Browsing waits for view state changes, don't keep it waiting
+        await self.browser.async_state_updated()
+        now = time.monotonic()
+        if now > self._poll_replies_until:
+            self._last_push = now
+        if self._push_pending_since is None:
+            self._push_pending_since = now
+        self._push_pending_count += 1
+        if self._push_window <= 0:
+            self._async_flush_pushes()
+        elif not self._push_flush_unsub:
+            self._push_flush_unsub = async_call_later(
+                self.hass, self._push_window, self._async_flush_pushes
+            )
+
+    @callback
+    def async_flush_pushes(self) -> None:
+        """Dispatch the pushed updates collected so far, without waiting."""
+        if self._push_flush_unsub:
+            self._push_flush_unsub()
+        self._async_flush_pushes()
+
+    @callback
+    def _async_flush_pushes(self, _now=None) -> None:
+        """Dispatch the pushed updates collected so far."""
+        self._push_flush_unsub = None
+        if self._push_pending_since is None or not self._device:
+            return
+        self.push_stats.record(
+            self._push_pending_count, time.monotonic() - self._push_pending_since
+        )
+        self._push_pending_since = None
+        self._push_pending_count = 0
+
+        self._async_adjust_update_interval()
+        snapshot = self._async_build_snapshot()
+        if snapshot is self.data and self.last_update_success:
+            return
+        self.async_set_updated_data(snapshot)
 
     # async def runner_task(self):
     #     try:
@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import asyncio
 from collections import defaultdict
-from typing import NamedTuple, cast
+from typing import Any, NamedTuple, cast
+from urllib.parse import urlparse
 
 from async_upnp_client.aiohttp import AiohttpNotifyServer, AiohttpSessionRequester
 from async_upnp_client.client import UpnpRequester
@@ -13,8 +14,22 @@ from async_upnp_client.event_handler import UpnpEventHandler
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
 from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.service_info.ssdp import SsdpServiceInfo
+from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN, LOGGER
+from .art_cache import ArtCache
+from .const import (
+    DESCRIPTION_CACHE_SAVE_DELAY,
+    DOMAIN,
+    LOGGER,
+    POLL_INTERVAL_FALLBACK,
+    POLL_MAX_IN_FLIGHT,
+)
+from .mac_cache import MacAddressCache
+from .poll_scheduler import PollScheduler
+
+DESCRIPTION_STORAGE_VERSION = 1
+DESCRIPTION_STORAGE_KEY = f"{DOMAIN}.upnp_descriptions"
 
 
 class EventListenAddr(NamedTuple):
@@ -25,6 +40,16 @@ class EventListenAddr(NamedTuple):
     callback_url: str | None
 
 
+class DeviceDescription(NamedTuple):
+    """The parts of a UPnP device description we use."""
+
+    hostname: str
+    udn: str
+    friendly_name: str
+    # BOOTID.UPNP.ORG the description was fetched under, None if unknown
+    bootid: int | None
+
+
 class DlnaDmrData:
     """Storage class for domain global data."""
 
@@ -34,15 +59,91 @@ class DlnaDmrData:
     event_notifiers: dict[EventListenAddr, AiohttpNotifyServer]
     event_notifier_refs: defaultdict[EventListenAddr, int]
     stop_listener_remove: CALLBACK_TYPE | None = None
+    # Parsed UPnP device descriptions by location, loaded from the store on
+    # first use
+    descriptions: dict[str, DeviceDescription] | None = None
+    description_cache_hits: int = 0
+    description_cache_misses: int = 0
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize global data."""
+        self.hass = hass
         self.lock = asyncio.Lock()
         session = aiohttp_client.async_get_clientsession(hass, verify_ssl=False)
         self.requester = AiohttpSessionRequester(session, with_sleep=True)
         self.upnp_factory = UpnpFactory(self.requester, non_strict=True)
         self.event_notifiers = {}
         self.event_notifier_refs = defaultdict(int)
+        self.art_cache = ArtCache(hass)
+        self.mac_cache = MacAddressCache(hass)
+        self.poll_scheduler = PollScheduler(
+            POLL_INTERVAL_FALLBACK.total_seconds(), POLL_MAX_IN_FLIGHT
+        )
+        self.description_lock = asyncio.Lock()
+        self.description_fetches: dict[str, asyncio.Task[DeviceDescription]] = {}
+        self.description_store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, DESCRIPTION_STORAGE_VERSION, DESCRIPTION_STORAGE_KEY
+        )
+
+    async def async_get_device_description(
+        self, location: str, bootid: int | None
+    ) -> DeviceDescription:
+        """Return the description of the device at location, fetching it if needed.
+
+        A cached description is reused while the device advertises the same
+        BOOTID, which it changes when it reboots. When the BOOTID is not known
+        yet, e.g. right after Home Assistant started, the cached description
+        for the location is trusted.
+        """
+        async with self.description_lock:
+            if self.descriptions is None:
+                stored = await self.description_store.async_load() or {}
+                self.descriptions = {
+                    loc: DeviceDescription(**desc) for loc, desc in stored.items()
+                }
+
+        cached = self.descriptions.get(location)
+        if cached and (bootid is None or cached.bootid == bootid):
+            self.description_cache_hits += 1
+            return cached
+
+        self.description_cache_misses += 1
+        # Descriptions of different devices are fetched at the same time,
+        # those of the same device once
+        if not (fetch := self.description_fetches.get(location)):
+            fetch = self.description_fetches[location] = self.hass.async_create_task(
+                self._async_fetch_device_description(location, bootid),
+                eager_start=False,
+            )
+            fetch.add_done_callback(
+                lambda _: self.description_fetches.pop(location, None)
+            )
+        return await asyncio.shield(fetch)
+
+    async def _async_fetch_device_description(
+        self, location: str, bootid: int | None
+    ) -> DeviceDescription:
+        """Fetch the description of the device at location and cache it."""
+        upnp_device = await self.upnp_factory.async_create_device(location)
+        description = DeviceDescription(
+            hostname=cast(str, urlparse(upnp_device.device_info.url).hostname),
+            udn=upnp_device.udn,
+            friendly_name=upnp_device.friendly_name,
+            bootid=bootid,
+        )
+        assert self.descriptions is not None
+        self.descriptions[location] = description
+        self.description_store.async_delay_save(
+            self._descriptions_to_store, DESCRIPTION_CACHE_SAVE_DELAY
+        )
+        return description
+
+    def _descriptions_to_store(self) -> dict[str, dict[str, Any]]:
+        """Return the description cache as stored data."""
+        return {
+            location: desc._asdict()
+            for location, desc in (self.descriptions or {}).items()
+        }
 
     async def async_cleanup_event_notifiers(self, event: Event) -> None:
         """Clean up resources when Home Assistant is stopped."""
@@ -116,6 +217,16 @@ class DlnaDmrData:
                 self.stop_listener_remove = None
 
 
+def discovery_bootid(discovery: SsdpServiceInfo) -> int | None:
+    """Return the BOOTID.UPNP.ORG header of an SSDP discovery, if valid."""
+    if bootid := discovery.ssdp_headers.get("BOOTID.UPNP.ORG"):
+        try:
+            return int(bootid)
+        except ValueError:
+            pass
+    return None
+
+
 def get_domain_data(hass: HomeAssistant) -> DlnaDmrData:
     """Obtain this integration's domain data, creating it if needed."""
     if DOMAIN in hass.data:
@@ -0,0 +1,105 @@
+"""Snapshots of the settings of a Mu-so that can be restored later."""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+
+from homeassistant.components.media_player import MediaPlayerState
+
+from .media_browser import Path
+
+if TYPE_CHECKING:
+    from .coordinator import MusoCoordinator
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceScene:
+    """The settings of a device worth putting back after an announcement."""
+
+    powered: bool
+    # Input id, e.g. IRADIO
+    input: str | None
+    # Index of the iRadio preset playing, None when not playing a preset
+    preset: int | None
+    volume_level: float | None
+    is_volume_muted: bool | None
+    illum: int | None
+    playing: bool
+    # The browse list the device showed, None if not known
+    browse_path: Path | None
+
+
+def capture_scene(coordinator: MusoCoordinator) -> DeviceScene | None:
+    """Return the settings of the device, None if its state is not known yet."""
+    data = coordinator.data
+    if data is None:
+        return None
+    device = coordinator.device
+    return DeviceScene(
+        powered=data.player_state != MediaPlayerState.OFF,
+        input=device.input,
+        preset=current_preset(coordinator),
+        volume_level=data.volume_level,
+        is_volume_muted=data.is_volume_muted,
+        illum=data.illum,
+        playing=data.player_state in (MediaPlayerState.PLAYING, MediaPlayerState.BUFFERING),
+        browse_path=coordinator.browser.position,
+    )
+
+
+def current_preset(coordinator: MusoCoordinator) -> int | None:
+    """Return the iRadio preset playing, matched by station name."""
+    data = coordinator.data
+    if coordinator.device.media_source != "iradio" or not data.media_title:
+        return None
+    for index, name in data.presets.items():
+        if name == data.media_title:
+            return index
+    return None
+
+
+def restore_commands(
+    coordinator: MusoCoordinator, scene: DeviceScene, current: DeviceScene
+) -> list[tuple[str, Callable[[], Awaitable[None]]]]:
+    """Return the commands that bring the device from current back to scene.
+
+    Only settings that differ get a command. The commands are named after
+    what they restore and have to be sent in order: the device is woken
+    first and put in standby last, the input is selected before a preset is
+    played or a list browsed to.
+    """
+    commands: list[tuple[str, Callable[[], Awaitable[None]]]] = []
+    if scene.powered and not current.powered:
+        commands.append(("power", coordinator.async_turn_on))
+    input_changed = scene.input is not None and scene.input != current.input
+    if input_changed:
+        commands.append(("input", partial(coordinator.async_select_input, scene.input)))
+    if scene.preset is not None and (input_changed or scene.preset != current.preset):
+        commands.append(("preset", partial(coordinator.async_select_preset, scene.preset)))
+    elif scene.playing != current.playing and scene.powered:
+        commands.append((
+            "play_state",
+            coordinator.async_media_play if scene.playing else coordinator.async_media_pause,
+        ))
+    if scene.volume_level is not None and scene.volume_level != current.volume_level:
+        commands.append((
+            "volume", partial(coordinator.async_set_volume_level, scene.volume_level)
+        ))
+    if scene.is_volume_muted is not None and scene.is_volume_muted != current.is_volume_muted:
+        commands.append((
+            "mute", partial(coordinator.async_mute_volume, scene.is_volume_muted)
+        ))
+    if scene.illum is not None and scene.illum != current.illum:
+        commands.append(("illum", partial(coordinator.async_set_illum, scene.illum)))
+    if scene.browse_path is not None and (
+        input_changed or scene.browse_path != current.browse_path
+    ):
+        commands.append((
+            "browse_path",
+            partial(coordinator.browser.async_restore_position, scene.browse_path),
+        ))
+    if not scene.powered and current.powered:
+        commands.append(("power", coordinator.async_turn_off))
+    return commands
@@ -0,0 +1,54 @@
+"""Diagnostics support for naim Mu-so."""
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_MAC
+from homeassistant.core import HomeAssistant
+
+from .data import get_domain_data
+
+TO_REDACT = {CONF_MAC}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = config_entry.runtime_data.coordinator
+    domain_data = get_domain_data(hass)
+    return {
+        "entry": {
+            "data": async_redact_data(config_entry.data, TO_REDACT),
+            "options": dict(config_entry.options),
+        },
+        "coordinator": {
+            "poll_interval": str(coordinator._poll_interval),
+            "update_interval": str(coordinator.update_interval),
+            "last_update_success": coordinator.last_update_success,
+            "snapshot_version": coordinator.data.version if coordinator.data else None,
+        },
+        "push": dataclasses.asdict(coordinator.push_stats),
+        "connection": dataclasses.asdict(coordinator.connection_stats),
+        "description_cache": {
+            "bootid": coordinator._bootid,
+            "hits": domain_data.description_cache_hits,
+            "misses": domain_data.description_cache_misses,
+        },
+        "commands": dataclasses.asdict(coordinator.commands.stats),
+        "optimistic": dataclasses.asdict(coordinator.optimistic_stats),
+        "browse": {
+            **dataclasses.asdict(coordinator.browser.stats),
+            "catalog_rows": coordinator.browser.catalog.rows,
+            "search_index_size": len(coordinator.browser.search_index),
+        },
+        "art_cache": dataclasses.asdict(domain_data.art_cache.stats),
+        "mac_cache": dataclasses.asdict(domain_data.mac_cache.stats),
+        "poll_scheduler": {
+            **dataclasses.asdict(domain_data.poll_scheduler.stats),
+            "spread": domain_data.poll_scheduler.spread(),
+        },
+    }
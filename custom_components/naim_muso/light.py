@@ -33,17 +33,22 @@ class MusoIllumination(BaseEntity, LightEntity):
     _attr_color_mode = ColorMode.BRIGHTNESS
     _attr_supported_color_modes = {ColorMode.BRIGHTNESS}
     _attr_translation_key = "illum"
+    _coordinator_fields = frozenset({"illum"})
 
     @property
     def brightness(self) -> Optional[int]:
         """Return the current brightness."""
-        _LOGGER.debug("MusoIllumination.brightness %s", self._device.state.illum)
-        return value_to_brightness(BRIGHTNESS_SCALE, self._device.state.illum)
+        illum = self.coordinator.data.illum
+        _LOGGER.debug("MusoIllumination.brightness %s", illum)
+        if illum is None:
+            return None
+        return value_to_brightness(BRIGHTNESS_SCALE, illum)
 
     @property
     def is_on(self) -> bool:
         """Return the current illumination state."""
-        return self._device.state.illum and self._device.state.illum > 0
+        illum = self.coordinator.data.illum
+        return illum is not None and illum > 0
 
     @property
     def translation_key(self) -> str:
@@ -58,10 +63,10 @@ class MusoIllumination(BaseEntity, LightEntity):
                     brightness_to_value(BRIGHTNESS_SCALE, kwargs[ATTR_BRIGHTNESS])
                 )
             )
-            await self._device.set_illum(value_in_range)
         else:
-            await self._device.set_illum(3)
+            value_in_range = 3
+        await self.coordinator.async_set_illum(value_in_range)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn illumination off."""
-        await self._device.set_illum(0)
+        await self.coordinator.async_set_illum(0)
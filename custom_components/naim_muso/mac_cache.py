@@ -0,0 +1,125 @@
+"""Cache of the MAC addresses of hosts on the local network."""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from functools import partial
+from ipaddress import IPv6Address, ip_address
+
+from getmac import get_mac_address
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from .const import LOGGER as _LOGGER, MAC_CACHE_NEGATIVE_TTL, MAC_CACHE_TTL
+
+
+@dataclass
+class MacCacheStats:
+    """Statistics on the MAC address cache."""
+
+    hits: int = 0
+    misses: int = 0
+    # Cached addresses returned while they were looked up again
+    stale_served: int = 0
+    # Lookups run in the executor
+    lookups: int = 0
+
+
+class MacAddressCache:
+    """MAC addresses by host, shared by discovery, config flows and entries.
+
+    getmac scans the ARP or neighbour table, which takes a while and is the
+    same for every SSDP announcement of a host. Addresses are kept for
+    MAC_CACHE_TTL seconds, failed lookups for MAC_CACHE_NEGATIVE_TTL. An
+    expired address is still returned while it is looked up again in the
+    background. Lookups of the same host run once.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.stats = MacCacheStats()
+        # Host to MAC address, or None if there is none, and the
+        # time.monotonic() it expires
+        self._entries: dict[str, tuple[str | None, float]] = {}
+        self._lookups: dict[str, asyncio.Task[str | None]] = {}
+
+    @callback
+    def async_seed(self, host: str, mac_address: str | None) -> None:
+        """Add an address known from elsewhere, e.g. a config entry.
+
+        It is looked up again the first time it is asked for.
+        """
+        if mac_address and host not in self._entries:
+            self._entries[host] = (mac_address, 0)
+
+    async def async_get(self, host: str) -> str | None:
+        """Return the MAC address of host, None if it can't be found."""
+        if cached := self._entries.get(host):
+            mac_address, expires = cached
+            if expires > time.monotonic():
+                self.stats.hits += 1
+                return mac_address
+            if mac_address:
+                self.stats.stale_served += 1
+                self._async_start_lookup(host)
+                return mac_address
+        self.stats.misses += 1
+        return await asyncio.shield(self._async_start_lookup(host))
+
+    @callback
+    def _async_start_lookup(self, host: str) -> asyncio.Task[str | None]:
+        """Look up the address of host, unless that is already happening."""
+        if not (lookup := self._lookups.get(host)):
+            lookup = self._lookups[host] = self.hass.async_create_background_task(
+                self._async_lookup(host), f"naim_muso mac lookup {host}"
+            )
+            lookup.add_done_callback(lambda _: self._lookups.pop(host, None))
+        return lookup
+
+    async def _async_lookup(self, host: str) -> str | None:
+        """Look up the address of host and cache the result."""
+        self.stats.lookups += 1
+        try:
+            mac_address = await _async_get_mac_address(self.hass, host)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Failed to look up the MAC address of %s: %r", host, err)
+            mac_address = None
+        if mac_address is None and (cached := self._entries.get(host)) and cached[0]:
+            # Keep the address we had, the host may just be slow to answer
+            mac_address = cached[0]
+        ttl = MAC_CACHE_TTL if mac_address else MAC_CACHE_NEGATIVE_TTL
+        self._entries[host] = (mac_address, time.monotonic() + ttl)
+        return mac_address
+
+
+async def _async_get_mac_address(hass: HomeAssistant, host: str) -> str | None:
+    """Get mac address from host name, IPv4 address, or IPv6 address."""
+    # Help mypy, which has trouble with the async_add_executor_job + partial call
+    mac_address: str | None
+    # getmac has trouble using IPv6 addresses as the "hostname" parameter so
+    # assume host is an IP address, then handle the case it's not.
+    try:
+        ip_addr = ip_address(host)
+    except ValueError:
+        mac_address = await hass.async_add_executor_job(
+            partial(get_mac_address, hostname=host)
+        )
+    else:
+        if ip_addr.version == 4:
+            mac_address = await hass.async_add_executor_job(
+                partial(get_mac_address, ip=host)
+            )
+        else:
+            # Drop scope_id from IPv6 address by converting via int
+            ip_addr = IPv6Address(int(ip_addr))
+            mac_address = await hass.async_add_executor_job(
+                partial(get_mac_address, ip6=str(ip_addr))
+            )
+
+    if not mac_address:
+        return None
+
+    return dr.format_mac(mac_address)
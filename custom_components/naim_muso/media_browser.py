@@ -1,132 +1,622 @@
-from typing import Any
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.media_player import (
+    BrowseError,
     BrowseMedia,
     MediaClass,
     MediaType,
     MediaPlayerEnqueue
 )
+from homeassistant.core import callback
 from naimco import NaimCo
 import asyncio
 
-from .const import LOGGER as _LOGGER
+from .const import (
+    BROWSE_CACHE_MAX_PAGES,
+    BROWSE_PREFETCH_IDLE,
+    BROWSE_CACHE_TTLS,
+    BROWSE_PAGE_SIZE,
+    BROWSE_READY_POLL,
+    BROWSE_READY_TIMEOUT,
+    SEARCH_MAX_RESULTS,
+    CONF_BROWSE_PREFETCH,
+    CONF_BROWSE_PREFETCH_BUDGET,
+    DEFAULT_BROWSE_PREFETCH,
+    DEFAULT_BROWSE_PREFETCH_BUDGET,
+    LOGGER as _LOGGER,
+)
 
+from .browse_catalog import BrowseCatalog
+from .search_index import SearchIndex
 
-async def async_browse_media(
-    device: NaimCo, media_content_type: str | None = None, media_content_id: str | None = None
-) -> BrowseMedia:
-    """ Browse available media, only radio presets for the moment"""
-    _LOGGER.debug("async_browse_media %s %s",
-                  media_content_type, media_content_id)
-    if media_content_id is None:
-        category = "root"
-    else:
-        (category, _, selection) = media_content_id.partition("/")
-
-    if category == "root" or media_content_id is None:
-        seq = []
-        for key, value in device.presets.items():
-            seq.append(BrowseMedia(media_class=MediaClass.CHANNEL, media_content_id=f"radio/{key}",
-                                   media_content_type=MediaType.CHANNEL, title=value,
-                                   can_play=True, can_expand=False))
-        seq.append(BrowseMedia(media_class=MediaClass.DIRECTORY, media_content_id="browse",
-                               media_content_type=MediaType.CHANNELS, title="Browse",
-                               can_play=False, can_expand=True))
-
-        return BrowseMedia(media_class=MediaClass.DIRECTORY, media_content_id="presets",
-                           media_content_type=MediaType.CHANNELS, title="Favourites",
-                           can_play=False, can_expand=True,
-                           children=seq, children_media_class=MediaClass.CHANNEL)
-    if category == "browse":
-        if selection == "up":
-            await device.controller.nvm.send_command("BROWSEPARENT", wait_for_reply_timeout=10)
-        elif selection:
-            await device.select_row(selection, wait_for_reply_timeout=10)
-        await asyncio.wait_for(initiate_browsing(device), timeout=120)
-        # await initiate_browsing(device)
-        kids = []
-        if device.state.active_list["depth"] > 0:
-            kids.append(BrowseMedia(media_class=MediaClass.DIRECTORY, media_content_id="browse/up",
-                                    media_content_type=MediaType.CHANNELS, title="Back",
-                                    can_play=False, can_expand=True))
-        for row in device.state.rows["rows"]:
-            _LOGGER.debug("row: %s", row)
-            m = row_to_media(row)
-            if m:
-                kids.append(m)
-        return BrowseMedia(media_class=MediaClass.DIRECTORY, media_content_id="root",
-                           media_content_type=MediaType.CHANNELS, title=device.state.active_list[
-                               "title"],
-                           can_play=False, can_expand=True,
-                           children=kids
-                           )
-    return None
+if TYPE_CHECKING:
+    from .coordinator import MusoCoordinator
 
-# @catch_comm_error
 
+def root_media(device: NaimCo) -> BrowseMedia:
+    """Presets and an entry to browse the device."""
+    seq = []
+    for key, value in device.presets.items():
+        seq.append(BrowseMedia(media_class=MediaClass.CHANNEL, media_content_id=f"radio/{key}",
+                               media_content_type=MediaType.CHANNEL, title=value,
+                               can_play=True, can_expand=False))
+    seq.append(BrowseMedia(media_class=MediaClass.DIRECTORY, media_content_id="browse",
+                           media_content_type=MediaType.CHANNELS, title="Browse",
+                           can_play=False, can_expand=True))
 
-async def async_play_media(
-    device: NaimCo,
-    media_type: str,
-    media_id: str,
-    enqueue: MediaPlayerEnqueue | None = None,
-    announce: bool | None = None, **kwargs: Any
-) -> None:
-    """Play a piece of media. Only working with iRadio presets for now"""
-    _LOGGER.debug("async_play_media %s %s", media_type, media_id)
-    (category, selection) = media_id.split("/")
-    if category == "radio":
-        await device.select_preset(selection)
-        return
-    if category == "browse":
-        await device.play_row(selection)
-        return
+    return BrowseMedia(media_class=MediaClass.DIRECTORY, media_content_id="presets",
+                       media_content_type=MediaType.CHANNELS, title="Favourites",
+                       can_play=False, can_expand=True,
+                       children=seq, children_media_class=MediaClass.CHANNEL)
 
 
-async def initiate_browsing(device: NaimCo):
-    """Initiate browsing."""
+@dataclass
+class CachedList:
+    """A converted page of a browse list and when it expires."""
 
-    await device.controller.nvm.send_command(
-        "SETVIEWSTATE BROWSE", wait_for_reply_timeout=10
-    )
-    await device.controller.nvm.send_command("GETVIEWSTATE", wait_for_reply_timeout=10)
-    waittime = 0.05
-    while device.state.viewstate["state"] != "BROWSE":
-        # ACHTUNG: This might never end
-        # Sometime we get  #NVM GETVIEWSTATE BROWSECANRESTART  ...
-        # what does that mean?
-        await asyncio.sleep(waittime)
-        waittime = min(waittime*2, 1)
+    media: BrowseMedia
+    expires: float
+
+
+@dataclass
+class BrowseStats:
+    """Statistics on the browse cache."""
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    # Requests that waited for the same page being fetched
+    coalesced: int = 0
+    # Rows fetched from the device
+    rows_fetched: int = 0
+    # BROWSEPARENT and row selections sent to move the browse cursor
+    navigation_steps: int = 0
+    # Requests sent to the device while browsing
+    round_trips: int = 0
+    # Pages served from the persisted catalog
+    catalog_hits: int = 0
+    # Catalog pages served while they were refreshed in the background
+    stale_served: int = 0
+    # Pages read ahead by the prefetcher
+    prefetched: int = 0
+    # Prefetch rounds stopped because the budget ran out
+    prefetch_over_budget: int = 0
+
+
+class RoundTripBudget:
+    """Token bucket limiting the device round trips spent per minute."""
+
+    def __init__(self, per_minute: int) -> None:
+        """Initialize a full bucket."""
+        self.per_minute = per_minute
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    @property
+    def available(self) -> bool:
+        """Return True if there is budget left."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.per_minute,
+            self._tokens + (now - self._updated) * self.per_minute / 60,
+        )
+        self._updated = now
+        return self._tokens > 0
+
+    def consume(self, round_trips: int) -> None:
+        """Spend round trips, the bucket can go into debt."""
+        self._tokens -= round_trips
+
+
+# Row indexes selected from the top list of the device to get to a list
+Path = tuple[int, ...]
+
+
+def browse_id(path: Path, page: int = 1) -> str:
+    """Content id of a page of the list at path, e.g. browse/3/5/p2."""
+    parts = ["browse", *(str(index) for index in path)]
+    if page > 1:
+        parts.append(f"p{page}")
+    return "/".join(parts)
+
+
+def page_bounds(page: int, count: int) -> tuple[int, int]:
+    """Return the first and last row of a page of a list of count rows.
+
+    Rows count from 1 and last is inclusive, last < first for a page past
+    the end of the list.
+    """
+    first = (page - 1) * BROWSE_PAGE_SIZE + 1
+    return first, min(page * BROWSE_PAGE_SIZE, count)
+
+
+def parse_browse_id(media_content_id: str) -> tuple[Path, int]:
+    """Return the path and page of a browse content id."""
+    path = []
+    page = 1
+    for part in media_content_id.split("/")[1:]:
+        if part.startswith("p"):
+            page = int(part[1:])
+        elif part:
+            path.append(int(part))
+    return tuple(path), page
+
+
+class MusoBrowser:
+    """Browse the lists of a Mu-so, caching the converted results.
+
+    Content ids hold the full path of row indexes from the top list, so they
+    stay valid whatever the device shows and several dashboards can browse at
+    once. The device has a single browse cursor though. Requests that need it
+    are serialized and it is moved along the shortest way from where it is,
+    up to the common parent and down from there. Concurrent requests for the
+    same page share one fetch. The first time, and whenever the position of
+    the cursor is unknown, it is moved to the top list.
+
+    Optionally the first folders of a list the user opened are read ahead,
+    once nobody used the device for BROWSE_PREFETCH_IDLE seconds and within a
+    budget of device round trips per minute. Prefetching stops as soon as
+    the user browses or sends a command.
+
+    Pages read from the device are also kept in a persisted catalog. After a
+    restart they are served from it, stale pages are served as well while
+    they are fetched again in the background.
+
+    Cached pages are returned without touching the device. Lists are fetched
+    a page of BROWSE_PAGE_SIZE rows at a time, the last row of a page that
+    isn't the last one opens the next page. Only pages that were looked at
+    are converted and at most BROWSE_CACHE_MAX_PAGES are kept.
+    """
+
+    def __init__(self, coordinator: MusoCoordinator) -> None:
+        """Initialize the browser."""
+        self.coordinator = coordinator
+        self.stats = BrowseStats()
+        self._cache: OrderedDict[tuple[Path, int], CachedList] = OrderedDict()
+        # Held while moving the device cursor and reading lists
+        self._lock = asyncio.Lock()
+        # Fetches in progress, by path and page
+        self._fetches: dict[tuple[Path, int], asyncio.Task[BrowseMedia]] = {}
+        # The list the device cursor is at, None if unknown
+        self._device_path: Path | None = None
+        # GetActiveList reply for the list at _device_path, None when the
+        # device has to be asked again
+        self._active_list: dict | None = None
+        # Notified whenever the device state changed
+        self._state_changed = asyncio.Condition()
+        options = coordinator.config_entry.options
+        self._prefetch_count: int = options.get(
+            CONF_BROWSE_PREFETCH, DEFAULT_BROWSE_PREFETCH
+        )
+        self._prefetch_budget = RoundTripBudget(
+            options.get(CONF_BROWSE_PREFETCH_BUDGET, DEFAULT_BROWSE_PREFETCH_BUDGET)
+        )
+        self._prefetch_task: asyncio.Task[None] | None = None
+        # time.monotonic() the user last browsed or sent a command
+        self._last_activity: float = 0
+        self.catalog = BrowseCatalog(coordinator.hass, coordinator.config_entry.entry_id)
+        # Rows of every page read from the device, for searching
+        self.search_index = SearchIndex()
+        self._preset_index = SearchIndex()
+        self._indexed_presets: dict[int, str] = {}
+
+    @property
+    def _device(self) -> NaimCo:
+        return self.coordinator.device
+
+    @property
+    def position(self) -> Path | None:
+        """Return the path of the list the device cursor is at, None if unknown."""
+        if self._device_path is None or None in self._device_path:
+            return None
+        return self._device_path
+
+    async def async_restore_position(self, path: Path) -> None:
+        """Move the device cursor back to the list at path."""
+        self.async_pause_prefetch()
+        async with self._lock:
+            await self._async_navigate(path)
+
+    @callback
+    def async_invalidate(self) -> None:
+        """Forget cached lists and where the device cursor is."""
+        _LOGGER.debug("Invalidating browse cache")
+        self.stats.invalidations += 1
+        self._cache.clear()
+        self._device_path = None
+        self._active_list = None
+
+    @callback
+    def async_input_changed(self) -> None:
+        """Forget everything, each input has its own lists."""
+        self.async_invalidate()
+        self.search_index.clear()
+
+    @callback
+    def async_search(self, query: str) -> list[BrowseMedia]:
+        """Search the presets and the rows browsed so far.
+
+        Results can be played or browsed directly, their ids hold the full
+        path to the row. Without a device only what was indexed before is
+        searched.
+        """
+        if self._device is not None and (
+            (presets := self._device.presets) != self._indexed_presets
+        ):
+            self._preset_index.clear()
+            for media in root_media(self._device).children:
+                if media.can_play:
+                    self._preset_index.add(media)
+            self._indexed_presets = dict(presets)
+        results = self._preset_index.search(query, SEARCH_MAX_RESULTS)
+        results += self.search_index.search(query, SEARCH_MAX_RESULTS - len(results))
+        return results
+
+    @callback
+    def async_pause_prefetch(self) -> None:
+        """Stop prefetching, the user is using the device.
+
+        A page being fetched is finished, it may be waited for by the user.
+        """
+        self._last_activity = time.monotonic()
+        if self._prefetch_task:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+
+    @callback
+    def _async_schedule_prefetch(self, media: BrowseMedia) -> None:
+        """Read ahead the first folders of a list the user opened."""
+        if not self._prefetch_count:
+            return
+        parent, _ = parse_browse_id(media.media_content_id)
+        paths = []
+        for child in media.children or []:
+            path, page = parse_browse_id(child.media_content_id)
+            # Skip the back and more entries
+            if not child.can_expand or page > 1 or len(path) != len(parent) + 1:
+                continue
+            if (path, 1) not in self._cache:
+                paths.append(path)
+            if len(paths) == self._prefetch_count:
+                break
+        if paths:
+            self._prefetch_task = self.coordinator.config_entry.async_create_background_task(
+                self.coordinator.hass,
+                self._async_prefetch(paths),
+                f"naim_muso prefetch {media.media_content_id}",
+            )
+
+    async def _async_prefetch(self, paths: list[Path]) -> None:
+        """Fetch the first page of lists, while the device is idle."""
+        for path in paths:
+            while (idle := time.monotonic() - self._last_activity) < BROWSE_PREFETCH_IDLE:
+                await asyncio.sleep(BROWSE_PREFETCH_IDLE - idle)
+            if not self._prefetch_budget.available:
+                self.stats.prefetch_over_budget += 1
+                return
+            round_trips = self.stats.round_trips
+            try:
+                await self._async_browse_path(path, 1, prefetch=True)
+            except BrowseError as err:
+                _LOGGER.debug("Prefetching %s failed: %s", path, err)
+                return
+            finally:
+                self._prefetch_budget.consume(self.stats.round_trips - round_trips)
+            self.stats.prefetched += 1
+
+    async def async_state_updated(self) -> None:
+        """Wake up browsing waiting for the device, called on every state change."""
+        async with self._state_changed:
+            self._state_changed.notify_all()
+
+    async def _async_initiate_browsing(self, device: NaimCo) -> None:
+        """Switch the device to browsing and read the list it shows."""
         await device.controller.nvm.send_command(
-            "GETVIEWSTATE", wait_for_reply_timeout=10
+            "SETVIEWSTATE BROWSE", wait_for_reply_timeout=10
         )
+        self.stats.round_trips += 1
+        try:
+            async with asyncio.timeout(BROWSE_READY_TIMEOUT):
+                await self._async_wait_for_browse_view(device)
+        except TimeoutError as err:
+            raise BrowseError(
+                f"The Mu-so did not start browsing within {BROWSE_READY_TIMEOUT} s"
+            ) from err
+
+        # The view state is known to be BROWSE, only the list is asked for
+        await device.controller.send_command("GetActiveList", wait_for_reply_timeout=10)
+        self.stats.round_trips += 1
+        if not device.state.active_list:
+            raise BrowseError("The Mu-so did not report the list to browse")
+
+    async def _async_wait_for_browse_view(self, device: NaimCo) -> None:
+        """Wait until the view state pushed by the device is BROWSE.
+
+        The device pushes view state changes, it is only asked again when it
+        has been quiet for BROWSE_READY_POLL seconds.
+        """
+        async with self._state_changed:
+            while True:
+                viewstate = device.state.viewstate or {}
+                state = viewstate.get("state")
+                if state == "BROWSE":
+                    return
+                if state == "BROWSECANRESTART":
+                    raise BrowseError(
+                        "The Mu-so can't browse this input right now (BROWSECANRESTART)"
+                    )
+                try:
+                    async with asyncio.timeout(BROWSE_READY_POLL):
+                        await self._state_changed.wait()
+                except TimeoutError:
+                    _LOGGER.debug("Still waiting to browse, view state %s", state)
+                    await device.controller.nvm.send_command("GETVIEWSTATE")
+                    self.stats.round_trips += 1
+
+    async def async_browse_media(
+        self, media_content_type: str | None = None, media_content_id: str | None = None
+    ) -> BrowseMedia:
+        """ Browse available media, only radio presets for the moment"""
+        _LOGGER.debug("async_browse_media %s %s",
+                      media_content_type, media_content_id)
+        if media_content_id is None:
+            category = "root"
+        else:
+            (category, _, selection) = media_content_id.partition("/")
 
-    await asyncio.sleep(0.5)
+        if category == "root" or media_content_id is None:
+            return root_media(self._device)
+        if category == "browse":
+            return await self._async_browse_path(*parse_browse_id(media_content_id))
+        raise BrowseError(f"Media not found: {media_content_type} / {media_content_id}")
 
-    await device.controller.send_command("GetViewState", wait_for_reply_timeout=10)
-    await device.controller.send_command("GetActiveList", wait_for_reply_timeout=10)
-    list_handle = device.state.active_list["list_handle"]
+    async def async_play_media(
+        self,
+        media_type: str,
+        media_id: str,
+        enqueue: MediaPlayerEnqueue | None = None,
+        announce: bool | None = None, **kwargs: Any
+    ) -> None:
+        """Play a piece of media. Only working with iRadio presets for now"""
+        _LOGGER.debug("async_play_media %s %s", media_type, media_id)
+        (category, _, selection) = media_id.partition("/")
+        if category == "radio":
+            await self.coordinator.async_select_preset(selection)
+            return
+        if category == "browse":
+            path, _ = parse_browse_id(media_id)
+            if not path:
+                raise BrowseError(f"Can't play a list: {media_id}")
+            self.async_pause_prefetch()
+            async with self._lock:
+                await self._async_navigate(path[:-1])
+                await self._device.play_row(path[-1])
+                # Playing leaves the browse view
+                self._active_list = None
+            return
+        raise BrowseError(f"Media not found: {media_type} / {media_id}")
+
+    async def _async_browse_path(
+        self, path: Path, page: int, prefetch: bool = False
+    ) -> BrowseMedia:
+        """Return a page of the list at path, from the cache if it is still fresh."""
+        if not prefetch:
+            self.async_pause_prefetch()
+        media = await self._async_get_page(path, page)
+        if not prefetch:
+            self._async_schedule_prefetch(media)
+        return media
+
+    async def _async_get_page(self, path: Path, page: int) -> BrowseMedia:
+        """Return a page from the cache, or fetch it."""
+        key = (path, page)
+        if cached := self._cache.get(key):
+            if cached.expires > time.monotonic():
+                self.stats.hits += 1
+                self._cache.move_to_end(key)
+                if input_id := self._device.input:
+                    # Keeps lists browsed often in the catalog
+                    self.catalog.async_touch(input_id, browse_id(path, page))
+                return cached.media
+            del self._cache[key]
+
+        await self.catalog.async_load()
+        input_id = self._device.input
+        if input_id and (stored := self.catalog.async_get(input_id, browse_id(path, page))):
+            media, fetched = stored
+            self.stats.catalog_hits += 1
+            self._async_index(path, media)
+            fresh_for = self._ttl(path) - (time.time() - fetched)
+            if fresh_for <= 0:
+                # Serve it anyway and refresh it in the background
+                self.stats.stale_served += 1
+                self._async_start_fetch(path, page).add_done_callback(
+                    self._async_refresh_done
+                )
+            self._async_cache_page(path, page, media, fresh_for)
+            return media
+
+        if key in self._fetches:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+        # A request that is cancelled doesn't cancel the fetch others wait for
+        return await asyncio.shield(self._async_start_fetch(path, page))
+
+    @callback
+    def _async_start_fetch(self, path: Path, page: int) -> asyncio.Task[BrowseMedia]:
+        """Start fetching a page, unless it is already being fetched."""
+        key = (path, page)
+        if not (fetch := self._fetches.get(key)):
+            fetch = self.coordinator.config_entry.async_create_task(
+                self.coordinator.hass,
+                self._async_fetch(path, page),
+                f"naim_muso browse {browse_id(path, page)}",
+            )
+            self._fetches[key] = fetch
+            fetch.add_done_callback(lambda _: self._fetches.pop(key, None))
+        return fetch
+
+    @staticmethod
+    def _async_refresh_done(fetch: asyncio.Task[BrowseMedia]) -> None:
+        """Log a failed background refresh of a stale page."""
+        if not fetch.cancelled() and (err := fetch.exception()):
+            _LOGGER.debug("Failed to refresh a stale browse list: %r", err)
+
+    @staticmethod
+    def _ttl(path: Path) -> float:
+        """Return the seconds a list at path stays fresh."""
+        return BROWSE_CACHE_TTLS[min(len(path), len(BROWSE_CACHE_TTLS) - 1)]
+
+    @callback
+    def _async_cache_page(
+        self, path: Path, page: int, media: BrowseMedia, fresh_for: float
+    ) -> None:
+        """Keep a page in memory for fresh_for seconds."""
+        self._cache[(path, page)] = CachedList(media, time.monotonic() + fresh_for)
+        self._cache.move_to_end((path, page))
+        while len(self._cache) > BROWSE_CACHE_MAX_PAGES:
+            self._cache.popitem(last=False)
+
+    @callback
+    def _async_index(self, path: Path, media: BrowseMedia) -> None:
+        """Add the rows of a page to the search index."""
+        for child in media.children:
+            child_path, child_page = parse_browse_id(child.media_content_id)
+            # Skip the back and more entries
+            if child_page == 1 and len(child_path) == len(path) + 1:
+                self.search_index.add(child)
+
+    async def _async_fetch(self, path: Path, page: int) -> BrowseMedia:
+        """Read a page of the list at path from the device and cache it."""
+        async with self._lock:
+            device = self._device
+            await self._async_navigate(path)
+            if self._active_list is None:
+                await self._async_initiate_browsing(device)
+                self._active_list = device.state.active_list
+                if self._active_list["depth"] != len(path):
+                    # The device was browsed from elsewhere
+                    _LOGGER.debug(
+                        "Browse depth %s does not match path %s",
+                        self._active_list["depth"], path,
+                    )
+                    self.async_invalidate()
+                    raise BrowseError("The Mu-so was browsed from elsewhere, try again")
+
+            first, last = page_bounds(page, self._active_list["count"])
+            self.stats.round_trips += 1
+            try:
+                rows = await get_rows(device, self._active_list["list_handle"], first, last)
+            except BrowseError:
+                # The list may be gone, ask for it again next time
+                self._active_list = None
+                raise
+            self.stats.rows_fetched += len(rows)
+            media = list_media(path, self._active_list, rows, page, last)
+            input_id = device.input
+
+        self._async_index(path, media)
+        self._async_cache_page(path, page, media, self._ttl(path))
+        if input_id:
+            self.catalog.async_put(input_id, media)
+        return media
+
+    async def _async_navigate(self, path: Path) -> None:
+        """Move the device cursor to the list at path, the shortest way."""
+        device = self._device
+        if self._device_path is None:
+            # Don't know where the cursor is, start from the top list
+            await self._async_initiate_browsing(device)
+            self._device_path = (None,) * device.state.active_list["depth"]
+            self._active_list = device.state.active_list
+        device_path = self._device_path
+        if path == device_path:
+            return
+        common = 0
+        while (
+            common < min(len(path), len(device_path))
+            and path[common] == device_path[common]
+        ):
+            common += 1
+        self._active_list = None
+        # Unknown if the steps below all work, start from the top next time
+        self._device_path = None
+        for _ in range(len(device_path) - common):
+            await device.controller.nvm.send_command(
+                "BROWSEPARENT", wait_for_reply_timeout=10)
+        for index in path[common:]:
+            await device.select_row(index, wait_for_reply_timeout=10)
+        steps = len(device_path) - common + len(path) - common
+        self.stats.navigation_steps += steps
+        self.stats.round_trips += steps
+        self._device_path = path
+
+
+def list_media(
+    path: Path, active_list: dict, rows: list[dict], page: int, last: int
+) -> BrowseMedia:
+    """Convert a page of rows of the list at path."""
+    kids = []
+    if page == 1 and path:
+        kids.append(BrowseMedia(media_class=MediaClass.DIRECTORY,
+                                media_content_id=browse_id(path[:-1]),
+                                media_content_type=MediaType.CHANNELS, title="Back",
+                                can_play=False, can_expand=True))
+    for row in rows:
+        _LOGGER.debug("row: %s", row)
+        m = row_to_media(path, row)
+        if m:
+            kids.append(m)
+    count = active_list["count"]
+    if last < count:
+        next_first, next_last = page_bounds(page + 1, count)
+        kids.append(BrowseMedia(media_class=MediaClass.DIRECTORY,
+                                media_content_id=browse_id(path, page + 1),
+                                media_content_type=MediaType.CHANNELS,
+                                title=f"More ({next_first}-{next_last} of {count})",
+                                can_play=False, can_expand=True))
+    title = active_list["title"]
+    if page > 1:
+        title = f"{title} ({page})"
+    return BrowseMedia(media_class=MediaClass.DIRECTORY,
+                       media_content_id=browse_id(path, page),
+                       media_content_type=MediaType.CHANNELS, title=title,
+                       can_play=False, can_expand=True,
+                       children=kids
+                       )
 
-    list_handle = device.state.active_list["list_handle"]
-    count = device.state.active_list["count"]
 
+async def get_rows(device: NaimCo, list_handle: int, first: int, last: int) -> list[dict]:
+    """Get rows first to last, inclusive and counting from 1, of a list."""
+    if last < first:
+        return []
+    device.state.set_rows(None)
     await device.controller.send_command(
         "GetRows",
         [
             {"item": {"name": "list_handle", "int": f"{list_handle}"}},
-            {"item": {"name": "from", "int": "1"}},
-            {"item": {"name": "to", "int": f"{count}"}},
+            {"item": {"name": "from", "int": f"{first}"}},
+            {"item": {"name": "to", "int": f"{last}"}},
         ],
         wait_for_reply_timeout=10,
     )
+    if not device.state.rows:
+        raise BrowseError("No reply from the Mu-so while reading the list")
+    return device.state.rows["rows"]
 
 
-def row_to_media(row: dict) -> BrowseMedia:
+def row_to_media(path: Path, row: dict) -> BrowseMedia:
     """Convert row to media."""
     if row.get("play", 0) == 1:
         return BrowseMedia(
             media_class=MediaClass.CHANNEL,
-            media_content_id=f"browse/{row['index']}",
+            media_content_id=browse_id((*path, row["index"])),
             media_content_type=MediaType.CHANNEL,
             title=row["text"],
             can_play=True,
@@ -136,7 +626,7 @@ def row_to_media(row: dict) -> BrowseMedia:
     if row.get("browse", 0) == 1:
         return BrowseMedia(
             media_class=MediaClass.DIRECTORY,
-            media_content_id=f"browse/{row['index']}",
+            media_content_id=browse_id((*path, row["index"])),
             media_content_type=MediaType.CHANNEL,
             title=row["text"],
             can_play=False,
@@ -1,6 +1,7 @@
 """Naim Mu-so Media Player."""
 
 
+from copy import copy
 from typing import Any
 import datetime
 
@@ -14,7 +15,9 @@ from homeassistant.components.media_player import (
     MediaPlayerState,
     BrowseMedia,
     MediaPlayerEnqueue,
-    MediaType
+    MediaType,
+    SearchMedia,
+    SearchMediaQuery,
 )
 
 from homeassistant.core import HomeAssistant, callback
@@ -22,9 +25,9 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
 from .base_entity import BaseEntity
+from .data import get_domain_data
 
 from .const import LOGGER as _LOGGER
-from . import media_browser
 
 
 async def async_setup_entry(
@@ -48,6 +51,12 @@ async def async_setup_entry(
 class NaimMediaPlayer(BaseEntity, MediaPlayerEntity):
     """NaimMediaPlayer to interface with naim Mu-so."""
     _attr_name = None
+    _coordinator_fields = frozenset({
+        "player_state", "volume_level", "is_volume_muted", "source", "source_list",
+        "media_content_type", "media_duration", "media_position",
+        "media_position_updated_at", "media_image_url", "media_title",
+        "media_artist", "media_album_name",
+    })
 
     # def __init__(self, coordinator):
     #     """Pass coordinator to CoordinatorEntity."""
@@ -74,14 +83,6 @@ class NaimMediaPlayer(BaseEntity, MediaPlayerEntity):
     def _device(self) -> NaimCo | None:
         return self.coordinator._device
 
-    @property
-    def available(self) -> bool:
-        """Device available if we have a connection to it"""
-        if self._device:
-            return True
-        else:
-            return False
-
     # @property
     # def unique_id(self) -> str:
     #     self.coordinator.unique_id
@@ -108,6 +109,7 @@ class NaimMediaPlayer(BaseEntity, MediaPlayerEntity):
             | MediaPlayerEntityFeature.VOLUME_STEP
             | MediaPlayerEntityFeature.SELECT_SOURCE
             | MediaPlayerEntityFeature.BROWSE_MEDIA
+            | MediaPlayerEntityFeature.SEARCH_MEDIA
             | MediaPlayerEntityFeature.PLAY_MEDIA
             | MediaPlayerEntityFeature.STOP
             | MediaPlayerEntityFeature.PAUSE
@@ -120,122 +122,102 @@ class NaimMediaPlayer(BaseEntity, MediaPlayerEntity):
 
     async def async_turn_on(self) -> None:
         """Turn the media player off."""
-        await self._device.on()
+        await self.coordinator.async_turn_on()
 
     async def async_turn_off(self) -> None:
         """Turn the media player off."""
-        await self._device.off()
+        await self.coordinator.async_turn_off()
 
     async def async_media_stop(self) -> None:
         """Stop media playing."""
-        await self._device.stop()
+        await self.coordinator.async_media_stop()
 
     async def async_media_pause(self) -> None:
         """Pause media playing."""
-        await self._device.pause()
+        await self.coordinator.async_media_pause()
 
     async def async_media_play(self) -> None:
         """Play media."""
-        await self._device.play()
+        await self.coordinator.async_media_play()
 
     async def async_media_next_track(self) -> None:
         """Send next track command."""
-        await self._device.nexttrack()
+        await self.coordinator.async_media_next_track()
 
     async def async_media_previous_track(self) -> None:
         """Send next track command."""
-        await self._device.prevtrack()
+        await self.coordinator.async_media_previous_track()
 
     async def async_mute_volume(self, mute: bool) -> None:
         """Mute the volume."""
-        await self._device.mute(mute)
+        await self.coordinator.async_mute_volume(mute)
 
     async def async_volume_up(self) -> None:
         """Turn volume up for media player.
 
         This method is a coroutine.
         """
-        await self._device.volume_up()
+        await self.coordinator.async_volume_up()
 
     async def async_volume_down(self) -> None:
         """Turn volume down for media player.
 
         This method is a coroutine.
         """
-        await self._device.volume_down()
+        await self.coordinator.async_volume_down()
 
     async def async_set_volume_level(self, volume: float) -> None:
         """Set volume level, range 0..1."""
-        await self._device.set_volume(int(100 * volume))
+        await self.coordinator.async_set_volume_level(volume)
 
     @property
     def volume_level(self) -> float | None:
         """Volume level of the media player (0..1)."""
-        vol = self._device.volume
-        if vol:
-            return int(self._device.volume) / 100.0
-        return None
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.volume_level
 
     @property
     def is_volume_muted(self) -> bool | None:
         """Boolean if volume is currently muted."""
-        return self._device.is_muted
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.is_volume_muted
 
     @property
     def state(self) -> MediaPlayerState | None:
         """State of the player. Is it on or off?"""
-        stbystate = None
-        if not self._device or not self.available:
+        if not self.available:
             return None
-        try:
-            stbystate = self._device.standbystatus.get("state")
-            if stbystate == "ON":
-                return MediaPlayerState.OFF
-                # return MediaPlayerState.STANDBY
-        except AttributeError:
-            # return None
-            pass
-        if self._device.state.bufferstate and int(self._device.state.bufferstate) < 20:
-            return MediaPlayerState.BUFFERING
-        if self._device.state.viewstate and self._device.state.viewstate.get("phase") == "PAUSE":
-            return MediaPlayerState.PAUSED
-        if self._device.state.viewstate and self._device.state.viewstate.get("state") == "PLAYING":
-            return MediaPlayerState.PLAYING
-
-        if stbystate and stbystate == "OFF":
-            return MediaPlayerState.ON
-        # TOD O: There are other states to consider
-        return MediaPlayerState.IDLE
+        # Worked out by the coordinator, see snapshot.py
+        return self.coordinator.data.player_state
 
     @property
     def source(self) -> str | None:
         """Get the currently selected input."""
-        if not self._device or not self.available:
+        if not self.available:
             return None
-        return self._device.inputs.get(self._device.input, None)
+        return self.coordinator.data.source
 
     @property
     def source_list(self) -> list[str] | None:
         """Get a list of inputs available."""
-        if not self._device:
+        if not self.coordinator.data:
             return None
-        inputs = self._device.inputs
-        # _LOGGER.debug("Source_list inputs: %s", inputs)
-        return list(inputs.values())
+        return list(self.coordinator.data.source_list)
 
     async def async_select_source(self, source: str) -> None:
         """Select input source."""
-        inputs = self._device.inputs
-        for index, name in inputs.items():
-            if name == source:
-                await self._device.select_input(index)
+        await self.coordinator.async_select_source(source)
 
     async def async_browse_media(
         self, media_content_type: str | None = None, media_content_id: str | None = None
     ) -> BrowseMedia:
         """ Browse available media, only radio presets for the moment and NAIM supplies channels"""
         # browse_media code is messy, keep it a separate file
-        return await media_browser.async_browse_media(self._device, media_content_type, media_content_id)
+        return self._proxy_thumbnails(
+            await self.coordinator.browser.async_browse_media(media_content_type, media_content_id)
+        )
 
     async def async_play_media(
         self,
@@ -245,62 +227,120 @@ class NaimMediaPlayer(BaseEntity, MediaPlayerEntity):
         announce: bool | None = None, **kwargs: Any
     ) -> None:
         """Play a piece of media. Only working with iRadio presets for now"""
-        return await media_browser.async_play_media(self._device, media_type, media_id, enqueue, announce, **kwargs)
+        return await self.coordinator.browser.async_play_media(media_type, media_id, enqueue, announce, **kwargs)
 
     @property
     def media_content_type(self) -> MediaType | str | None:
         """Source of current playing media."""
-
-        source = self._device.media_source
-        if source == "iradio":
-            return MediaType.CHANNEL
-        if source in ("spotify", "tidal"):
-            return MediaType.TRACK
-        if source == "upnp":
-            return MediaType.TRACK
-
-        return None
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.media_content_type
 
     @property
     def media_duration(self) -> int | None:
         """Duration of current playing media in seconds."""
-        return self._device.media_duration
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.media_duration
 
     @property
     def media_position(self) -> int | None:
         """Position of current playing media in seconds."""
-        return self._device.now_playing_time
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.media_position
 
     @property
     def media_position_updated_at(self) -> datetime.datetime | None:
         """When was the position of the current playing media valid."""
-        return self._device.state.last_update.get("now_playing_time", None)
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.media_position_updated_at
 
     @property
     def media_image_url(self) -> str | None:
         """Image url of current playing media."""
-        return self._device.media_image_url
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.media_image_url
 
     @property
     def media_image_remotely_accessible(self) -> bool:
         """If the image url is remotely accessible."""
-        # it depends on what it playing, leave it at True for now
-        return True
+        # Served through Home Assistant from the art cache
+        return False
+
+    async def async_get_media_image(self) -> tuple[bytes | None, str | None]:
+        """Fetch the image of the current playing media from the art cache."""
+        if not (url := self.media_image_url):
+            return None, None
+        return await get_domain_data(self.hass).art_cache.async_get(url, "large")
+
+    async def async_get_browse_image(
+        self,
+        media_content_type: str,
+        media_content_id: str,
+        media_image_id: str | None = None,
+    ) -> tuple[bytes | None, str | None]:
+        """Fetch a browse thumbnail from the art cache."""
+        art_cache = get_domain_data(self.hass).art_cache
+        # Only art handed out in browse results is served
+        if not media_image_id or not (url := art_cache.url(media_image_id)):
+            return None, None
+        return await art_cache.async_get(url, "thumbnail")
+
+    def _proxy_thumbnail(self, media: BrowseMedia) -> BrowseMedia:
+        """Point the thumbnail of browse media to Home Assistant.
+
+        Browse results are cached with the original art URLs, the proxy URLs
+        hold an access token that expires.
+        """
+        if not media.thumbnail:
+            return media
+        media = copy(media)
+        media.thumbnail = self.get_browse_image_url(
+            media.media_content_type,
+            media.media_content_id,
+            get_domain_data(self.hass).art_cache.async_register(media.thumbnail),
+        )
+        return media
+
+    def _proxy_thumbnails(self, media: BrowseMedia) -> BrowseMedia:
+        """Point the thumbnails of the children of browse media to Home Assistant."""
+        media = copy(media)
+        media.children = [self._proxy_thumbnail(child) for child in media.children or []]
+        return media
+
+    async def async_search_media(self, query: SearchMediaQuery) -> SearchMedia:
+        """Search the presets and the lists browsed so far."""
+        results = self.coordinator.browser.async_search(query.search_query)
+        if query.media_filter_classes:
+            results = [
+                media for media in results
+                if media.media_class in query.media_filter_classes
+            ]
+        return SearchMedia(result=[self._proxy_thumbnail(media) for media in results])
 
     @property
     def media_title(self) -> str | None:
         """Title of current playing media."""
-        return self._device.media_title
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.media_title
 
     @property
     def media_artist(self) -> str | None:
         """Artist of current playing media, music track only."""
-        return self._device.media_artist
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.media_artist
 
     @property
     def media_album_name(self) -> str | None:
         """Album name of current playing media, music track only."""
-        return self._device.media_album_name
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.media_album_name
 
     # @property
     # def media_album_artist(self) -> str | None:
@@ -0,0 +1,111 @@
+"""Domain wide scheduling of the polls of all Mu-so devices."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import callback
+
+
+@dataclass
+class PollSchedulerStats:
+    """Statistics on the polls of all devices."""
+
+    polls: int = 0
+    # Polls that had to wait for others to finish
+    waited: int = 0
+    max_in_flight: int = 0
+
+
+class PollScheduler:
+    """Spread the polls of all devices evenly and cap the polls in flight.
+
+    Every device gets a phase within the base interval, evenly spaced in the
+    order the devices registered, and is polled on the slots of its phase.
+    Longer intervals are expected to be multiples of the base interval, so
+    devices keep their phase when they poll less often. At most max_in_flight
+    polls query their device at the same time.
+    """
+
+    def __init__(self, base_interval: float, max_in_flight: int) -> None:
+        """Initialize the scheduler."""
+        self.base_interval = base_interval
+        self.max_in_flight = max_in_flight
+        self.stats = PollSchedulerStats()
+        self._keys: list[str] = []
+        # Phase of the last poll of each device, in seconds into the base interval
+        self._last_phase: dict[str, float] = {}
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._in_flight = 0
+        self._epoch = time.monotonic()
+
+    @callback
+    def async_register(self, key: str) -> None:
+        """Add a device, the phases of all devices are spread again."""
+        if key not in self._keys:
+            self._keys.append(key)
+
+    @callback
+    def async_unregister(self, key: str) -> None:
+        """Remove a device, the phases of all devices are spread again."""
+        if key in self._keys:
+            self._keys.remove(key)
+        self._last_phase.pop(key, None)
+
+    def _phase(self, key: str) -> float:
+        """Return the seconds into the base interval a device polls at."""
+        if key not in self._keys:
+            return 0
+        return self._keys.index(key) * self.base_interval / len(self._keys)
+
+    def next_delay(self, key: str, interval: float) -> float:
+        """Return the seconds from now until the poll slot about interval away.
+
+        The slot is picked within half a base interval of interval, so the
+        delay may be a little shorter or longer than asked for.
+        """
+        now = time.monotonic()
+        base = self.base_interval
+        earliest = now + interval - base / 2 - self._epoch - self._phase(key)
+        slots = -(-earliest // base)
+        return self._epoch + self._phase(key) + slots * base - now
+
+    @asynccontextmanager
+    async def async_poll(self, key: str) -> AsyncIterator[None]:
+        """Wait for a free poll slot, hold it while querying the device."""
+        self.stats.polls += 1
+        if self._semaphore.locked():
+            self.stats.waited += 1
+        async with self._semaphore:
+            self._in_flight += 1
+            self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+            self._last_phase[key] = (time.monotonic() - self._epoch) % self.base_interval
+            try:
+                yield
+            finally:
+                self._in_flight -= 1
+
+    def spread(self) -> dict[str, Any]:
+        """Return how evenly the last polls of the devices are spread.
+
+        The gaps are the seconds between consecutive devices polling within
+        the base interval. Evenly spread polls have all gaps close to the
+        ideal gap.
+        """
+        phases = sorted(self._last_phase.values())
+        count = len(self._keys)
+        ideal = self.base_interval / count if count else None
+        if len(phases) < 2:
+            return {"devices": count, "ideal_gap": ideal, "min_gap": None, "max_gap": None}
+        gaps = [later - earlier for earlier, later in zip(phases, phases[1:])]
+        gaps.append(phases[0] + self.base_interval - phases[-1])
+        return {
+            "devices": count,
+            "ideal_gap": ideal,
+            "min_gap": round(min(gaps), 3),
+            "max_gap": round(max(gaps), 3),
+        }
@@ -0,0 +1,102 @@
+"""In-memory search index of media seen while browsing."""
+from __future__ import annotations
+
+import bisect
+import unicodedata
+from collections import defaultdict
+
+from homeassistant.components.media_player import BrowseMedia
+
+
+def normalize(text: str) -> str:
+    """Fold case and accents, so "Rás 2" is found searching for "ras"."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    """Split normalized text into words."""
+    return "".join(char if char.isalnum() else " " for char in normalize(text)).split()
+
+
+class SearchIndex:
+    """Index of browse media by the words of their titles.
+
+    Every query word has to be the start of a word of the title. Titles
+    starting with the query rank first, then titles with whole word matches,
+    then shorter titles.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._media: dict[str, BrowseMedia] = {}
+        self._words: defaultdict[str, set[str]] = defaultdict(set)
+        # Sorted words for prefix lookups, None when it has to be rebuilt
+        self._sorted_words: list[str] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of indexed media."""
+        return len(self._media)
+
+    def add(self, media: BrowseMedia) -> None:
+        """Add or replace media, by content id."""
+        content_id = media.media_content_id
+        if old := self._media.get(content_id):
+            if old.title == media.title:
+                self._media[content_id] = media
+                return
+            self.remove(content_id)
+        self._media[content_id] = media
+        for word in tokenize(media.title):
+            if word not in self._words:
+                self._sorted_words = None
+            self._words[word].add(content_id)
+
+    def remove(self, content_id: str) -> None:
+        """Remove media by content id."""
+        if not (media := self._media.pop(content_id, None)):
+            return
+        for word in tokenize(media.title):
+            ids = self._words[word]
+            ids.discard(content_id)
+            if not ids:
+                del self._words[word]
+                self._sorted_words = None
+
+    def clear(self) -> None:
+        """Remove all media."""
+        self._media.clear()
+        self._words.clear()
+        self._sorted_words = None
+
+    def search(self, query: str, limit: int) -> list[BrowseMedia]:
+        """Return up to limit media matching query, best matches first."""
+        words = tokenize(query)
+        if not words:
+            return []
+        if self._sorted_words is None:
+            self._sorted_words = sorted(self._words)
+        matches: set[str] | None = None
+        for word in words:
+            ids: set[str] = set()
+            start = bisect.bisect_left(self._sorted_words, word)
+            for indexed in self._sorted_words[start:]:
+                if not indexed.startswith(word):
+                    break
+                ids |= self._words[indexed]
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+
+        normalized_query = normalize(query)
+        query_words = set(words)
+
+        def rank(content_id: str) -> tuple[bool, int, int]:
+            title = self._media[content_id].title
+            return (
+                not normalize(title).startswith(normalized_query),
+                -len(query_words.intersection(tokenize(title))),
+                len(title),
+            )
+
+        return [self._media[content_id] for content_id in sorted(matches, key=rank)[:limit]]
@@ -91,6 +91,7 @@ class MusoTemperatureSensor(BaseSensor):
     from that class and then overrides specific attributes relevant to this sensor type.
     """
     _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _coordinator_fields = frozenset({"temperatures"})
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_suggested_display_precision = 0
@@ -100,11 +101,7 @@ class MusoTemperatureSensor(BaseSensor):
         """Return the state of the entity."""
         # Using native value and native unit of measurement, allows you to change units
         # in Lovelace and HA will automatically calculate the correct value.
-        try:
-            return self.coordinator.device.state._unit_temps[self.parameter].get(
-                "temp", None)
-        except KeyError:
-            return None
+        return self.coordinator.data.temperatures.get(self.parameter, None)
 
 
 class MusoVoltageSensor(BaseSensor):
@@ -113,6 +110,7 @@ class MusoVoltageSensor(BaseSensor):
     This inherits the ExampleBaseSensor and so uses all the properties and methods
     from that class and then overrides specific attributes relevant to this sensor type.
     """
+    _coordinator_fields = frozenset({"voltages"})
     _attr_device_class = SensorDeviceClass.VOLTAGE
     _attr_native_unit_of_measurement = UnitOfElectricPotential.MILLIVOLT
     _attr_suggested_display_precision = 0
@@ -122,7 +120,4 @@ class MusoVoltageSensor(BaseSensor):
         """Return the state of the entity."""
         # Using native value and native unit of measurement, allows you to change units
         # in Lovelace and HA will automatically calculate the correct value.
-        try:
-            return self.coordinator.device.state._voltages.get(self.parameter, None)
-        except KeyError:
-            return None
+        return self.coordinator.data.voltages.get(self.parameter, None)
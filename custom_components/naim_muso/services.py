@@ -0,0 +1,238 @@
+"""Services of the naim Mu-so controller integration."""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID, ENTITY_MATCH_ALL
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+
+from .const import DOMAIN, GROUP_CONTROL_TIMEOUT, LOGGER as _LOGGER, RESTORE_TIMEOUT
+from .coordinator import MusoCoordinator
+from .device_scene import capture_scene, restore_commands
+
+SERVICE_GROUP_CONTROL = "group_control"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+
+ATTR_ACTION = "action"
+ATTR_VOLUME_LEVEL = "volume_level"
+ATTR_SOURCE = "source"
+ATTR_TIMEOUT = "timeout"
+
+ACTIONS: dict[str, Callable[[MusoCoordinator, ServiceCall], Awaitable[None]]] = {
+    "turn_on": lambda coordinator, _: coordinator.async_turn_on(),
+    "turn_off": lambda coordinator, _: coordinator.async_turn_off(),
+    "mute": lambda coordinator, _: coordinator.async_mute_volume(True),
+    "unmute": lambda coordinator, _: coordinator.async_mute_volume(False),
+    "set_volume": lambda coordinator, call: coordinator.async_set_volume_level(
+        call.data[ATTR_VOLUME_LEVEL]
+    ),
+    "select_source": lambda coordinator, call: coordinator.async_select_source(
+        call.data[ATTR_SOURCE]
+    ),
+}
+
+
+def _check_action_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Check the data an action needs is present."""
+    if data[ATTR_ACTION] == "set_volume" and ATTR_VOLUME_LEVEL not in data:
+        raise vol.Invalid("volume_level is required to set the volume")
+    if data[ATTR_ACTION] == "select_source" and ATTR_SOURCE not in data:
+        raise vol.Invalid("source is required to select a source")
+    return data
+
+
+GROUP_CONTROL_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            # All speakers when left out
+            vol.Optional(ATTR_ENTITY_ID): cv.comp_entity_ids,
+            vol.Required(ATTR_ACTION): vol.In(ACTIONS),
+            vol.Optional(ATTR_VOLUME_LEVEL): cv.small_float,
+            vol.Optional(ATTR_SOURCE): cv.string,
+            vol.Optional(ATTR_TIMEOUT, default=GROUP_CONTROL_TIMEOUT): vol.All(
+                vol.Coerce(float), vol.Range(min=0.5, max=60)
+            ),
+        }
+    ),
+    _check_action_data,
+)
+
+SNAPSHOT_SCHEMA = vol.Schema({vol.Optional(ATTR_ENTITY_ID): cv.comp_entity_ids})
+
+RESTORE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTITY_ID): cv.comp_entity_ids,
+        vol.Optional(ATTR_TIMEOUT, default=RESTORE_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=0.5, max=120)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GROUP_CONTROL,
+        _async_group_control,
+        schema=GROUP_CONTROL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SNAPSHOT,
+        _async_snapshot,
+        schema=SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTORE,
+        _async_restore,
+        schema=RESTORE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def _async_coordinators(
+    hass: HomeAssistant, entity_ids: list[str] | None
+) -> dict[str, MusoCoordinator]:
+    """Return the coordinators of the media players, by entity id.
+
+    Without entity ids the coordinators of all loaded config entries are
+    returned, keyed by the entity id of their media player.
+    """
+    registry = er.async_get(hass)
+    coordinators = {}
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.state is not ConfigEntryState.LOADED:
+            continue
+        for entity in er.async_entries_for_config_entry(registry, entry.entry_id):
+            if entity.domain == "media_player" and (
+                entity_ids is None or entity.entity_id in entity_ids
+            ):
+                coordinators[entity.entity_id] = entry.runtime_data.coordinator
+    return coordinators
+
+
+async def _async_fan_out(
+    call: ServiceCall,
+    control: Callable[[MusoCoordinator], Awaitable[dict[str, Any] | None]],
+    timeout: float | None,
+) -> ServiceResponse:
+    """Run control on the speakers of a service call at once.
+
+    Every speaker gets timeout seconds, so the call takes as long as the
+    slowest speaker rather than all of them added up. Speakers that fail or
+    time out are reported without holding up the others. The details control
+    returns are added to the result of the speaker.
+    """
+    entity_ids = call.data.get(ATTR_ENTITY_ID)
+    if entity_ids == ENTITY_MATCH_ALL:
+        entity_ids = None
+    coordinators = _async_coordinators(call.hass, entity_ids)
+
+    async def _async_control(coordinator: MusoCoordinator) -> dict[str, Any]:
+        started = time.monotonic()
+        details = None
+        try:
+            async with asyncio.timeout(timeout):
+                details = await control(coordinator)
+        except TimeoutError:
+            error = f"No reply within {timeout} s"
+        except Exception as err:  # noqa: BLE001
+            error = str(err) or repr(err)
+        else:
+            error = None
+        if error:
+            _LOGGER.debug("%s failed on %s: %s", call.service, coordinator.name, error)
+        return {
+            "success": error is None,
+            "error": error,
+            "elapsed": round(time.monotonic() - started, 3),
+            **(details or {}),
+        }
+
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *(_async_control(coordinator) for coordinator in coordinators.values())
+    )
+    report = dict(zip(coordinators, results))
+    failed = [entity_id for entity_id, result in report.items() if not result["success"]]
+    if failed and not call.return_response:
+        raise HomeAssistantError(f"{call.service} failed on {', '.join(failed)}")
+    return {
+        "results": report,
+        "failed": failed,
+        "elapsed": round(time.monotonic() - started, 3),
+    }
+
+
+async def _async_group_control(call: ServiceCall) -> ServiceResponse:
+    """Send a command to many speakers at once."""
+    action = ACTIONS[call.data[ATTR_ACTION]]
+
+    async def _async_control(coordinator: MusoCoordinator) -> None:
+        if not coordinator.connected:
+            raise HomeAssistantError("Not connected")
+        await action(coordinator, call)
+
+    return await _async_fan_out(call, _async_control, call.data[ATTR_TIMEOUT])
+
+
+async def _async_snapshot(call: ServiceCall) -> ServiceResponse:
+    """Save the settings of many speakers, to put them back with restore.
+
+    The settings are taken from the state the coordinators hold, pushed
+    updates still being collected are applied first.
+    """
+
+    async def _async_control(coordinator: MusoCoordinator) -> dict[str, Any]:
+        coordinator.async_flush_pushes()
+        if not (scene := capture_scene(coordinator)):
+            raise HomeAssistantError("State not known yet")
+        coordinator.scene = scene
+        return {"scene": dataclasses.asdict(scene)}
+
+    return await _async_fan_out(call, _async_control, None)
+
+
+async def _async_restore(call: ServiceCall) -> ServiceResponse:
+    """Put back the settings saved by snapshot on many speakers at once.
+
+    Only the settings that changed since the snapshot are sent to a speaker,
+    in the order restore_commands gives them.
+    """
+
+    async def _async_control(coordinator: MusoCoordinator) -> dict[str, Any]:
+        if not (scene := coordinator.scene):
+            raise HomeAssistantError("No snapshot to restore")
+        if not coordinator.connected:
+            raise HomeAssistantError("Not connected")
+        coordinator.async_flush_pushes()
+        if not (current := capture_scene(coordinator)):
+            raise HomeAssistantError("State not known yet")
+        commands = restore_commands(coordinator, scene, current)
+        for _, send in commands:
+            await send()
+        return {"restored": [name for name, _ in commands]}
+
+    return await _async_fan_out(call, _async_control, call.data[ATTR_TIMEOUT])
@@ -0,0 +1,111 @@
+"""Immutable snapshots of the state of a Mu-so device."""
+from __future__ import annotations
+
+import datetime
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from homeassistant.components.media_player import MediaPlayerState, MediaType
+from naimco import NaimCo
+
+
+@dataclass(frozen=True, slots=True)
+class MusoSnapshot:
+    """Values derived from naimco's state at one point in time.
+
+    Built by the coordinator once per update so entities only read precomputed
+    values. Snapshots compare equal when the device state did not change, the
+    version is bumped by the coordinator every time it does.
+    """
+
+    player_state: MediaPlayerState | None
+    volume_level: float | None
+    is_volume_muted: bool | None
+    source: str | None
+    source_list: tuple[str, ...]
+    # Input id to name, e.g. IRADIO: iRadio
+    inputs: Mapping[str, str]
+    # Preset number to name
+    presets: Mapping[int, str]
+    media_content_type: MediaType | None
+    media_duration: int | None
+    media_position: int | None
+    media_position_updated_at: datetime.datetime | None
+    media_image_url: str | None
+    media_title: str | None
+    media_artist: str | None
+    media_album_name: str | None
+    illum: int | None
+    cleaningmode: bool | None
+    # Unit to temperature in degrees Celsius
+    temperatures: Mapping[str, int | None]
+    # Rail to voltage in millivolts
+    voltages: Mapping[str, int]
+    version: int = field(default=0, compare=False)
+
+
+def build_snapshot(device: NaimCo, version: int = 0) -> MusoSnapshot:
+    """Build a snapshot from the current state of a naimco device."""
+    state = device.state
+    inputs = device.inputs
+    volume = device.volume
+    return MusoSnapshot(
+        player_state=_player_state(device),
+        volume_level=int(volume) / 100.0 if volume else None,
+        is_volume_muted=device.is_muted,
+        source=inputs.get(device.input, None),
+        source_list=tuple(inputs.values()),
+        inputs=MappingProxyType(inputs),
+        presets=MappingProxyType(device.presets),
+        media_content_type=_media_content_type(device.media_source),
+        media_duration=device.media_duration,
+        media_position=device.now_playing_time,
+        # Set by the coordinator, which only moves it on playback transitions
+        media_position_updated_at=None,
+        media_image_url=device.media_image_url,
+        media_title=device.media_title,
+        media_artist=device.media_artist,
+        media_album_name=device.media_album_name,
+        illum=state.illum,
+        cleaningmode=state.cleaningmode,
+        temperatures=MappingProxyType(
+            {unit: val.get("temp", None) for unit, val in state._unit_temps.items()}
+        ),
+        voltages=MappingProxyType(dict(state._voltages)),
+        version=version,
+    )
+
+
+def _player_state(device: NaimCo) -> MediaPlayerState:
+    """State of the player. Is it on or off?"""
+    stbystate = None
+    if device.standbystatus:
+        stbystate = device.standbystatus.get("state")
+        if stbystate == "ON":
+            return MediaPlayerState.OFF
+            # return MediaPlayerState.STANDBY
+    state = device.state
+    if state.bufferstate and int(state.bufferstate) < 20:
+        return MediaPlayerState.BUFFERING
+    if state.viewstate and state.viewstate.get("phase") == "PAUSE":
+        return MediaPlayerState.PAUSED
+    if state.viewstate and state.viewstate.get("state") == "PLAYING":
+        return MediaPlayerState.PLAYING
+
+    if stbystate and stbystate == "OFF":
+        return MediaPlayerState.ON
+    # TOD O: There are other states to consider
+    return MediaPlayerState.IDLE
+
+
+def _media_content_type(source: str | None) -> MediaType | None:
+    """Media type of the current playing media, based on its source."""
+    if source == "iradio":
+        return MediaType.CHANNEL
+    if source in ("spotify", "tidal"):
+        return MediaType.TRACK
+    if source == "upnp":
+        return MediaType.TRACK
+
+    return None
@@ -24,10 +24,6 @@ async def async_setup_entry(
 
     coordinator: MusoCoordinator = entry.runtime_data.coordinator
 
-    if not coordinator._device:
-        _LOGGER.warning("Device not ready, skipping switch setup")
-        return
-
     async_add_entities([NaimCleaningModeSwitch(coordinator=coordinator)])
 
 
@@ -36,6 +32,7 @@ class NaimCleaningModeSwitch(BaseEntity, SwitchEntity):
 
     _attr_icon = "mdi:spray-bottle"
     _attr_translation_key = "cleaning_mode"
+    _coordinator_fields = frozenset({"cleaningmode"})
 
     def __init__(self, coordinator: MusoCoordinator) -> None:
         """Initialize the switch entity."""
@@ -46,22 +43,22 @@ class NaimCleaningModeSwitch(BaseEntity, SwitchEntity):
     @property
     def available(self) -> bool:
         """Return if the switch is available."""
-        return self.coordinator.device is not None
+        return super().available and self.coordinator.device is not None
 
     @property
     def is_on(self) -> bool:
         """Return True if cleaning mode is on."""
-        return self._device.state.cleaningmode
+        return self.coordinator.data.cleaningmode
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn on cleaning mode."""
         _LOGGER.debug("Turning on cleaning mode")
-        await self._device.set_cleaningmode(True)
+        await self.coordinator.async_set_cleaningmode(True)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn off cleaning mode."""
         _LOGGER.debug("Turning off cleaning mode")
-        await self._device.set_cleaningmode(False)
+        await self.coordinator.async_set_cleaningmode(False)
 
     # async def async_added_to_hass(self) -> None:
     #     """Run when entity is added to hass."""
@@ -0,0 +1,53 @@
+"""Persisted device state used to warm start after a restart."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from naimco import NaimState
+
+from .const import DOMAIN
+
+WARM_START_STORAGE_VERSION = 1
+
+
+def warm_start_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the warm start state of a config entry."""
+    return Store(hass, WARM_START_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.warm_start")
+
+
+def warm_start_data(state: NaimState) -> dict[str, Any]:
+    """Return the slow changing parts of the device state worth persisting."""
+    return {
+        # JSON keys are strings, the indexes are restored in seed_state
+        "inputblk": {str(index): val for index, val in state.inputblk.items()},
+        "presetblk": {str(index): val for index, val in state.presetblk.items()},
+        "totalpresets": state.totalpresets,
+        "product": state.product,
+        "serialnum": state.serialnum,
+        "roomname": state.roomname,
+        "illum": state.illum,
+        "briefnp": state.briefnp,
+        "now_playing": state.now_playing,
+    }
+
+
+def seed_state(state: NaimState, data: Mapping[str, Any]) -> None:
+    """Fill a fresh naimco state with persisted data.
+
+    Everything is replaced by what the device reports once connected.
+    """
+    for index, val in data.get("inputblk", {}).items():
+        state.set_inputblk_entry(int(index), val)
+    for index, val in data.get("presetblk", {}).items():
+        state.set_presetblk_entry(int(index), val)
+    state.totalpresets = data.get("totalpresets")
+    state.product = data.get("product")
+    state.serialnum = data.get("serialnum")
+    state.roomname = data.get("roomname")
+    state.illum = data.get("illum")
+    state.briefnp = data.get("briefnp")
+    if now_playing := data.get("now_playing"):
+        state.set_now_playing(now_playing)
@@ -0,0 +1,71 @@
+"""Benchmark of browsing a synthetic list of 10,000 rows.
+
+Run with pytest -s to see the timings.
+"""
+import time
+
+import pytest
+
+from custom_components.naim_muso import media_browser
+from custom_components.naim_muso.const import BROWSE_PAGE_SIZE
+from custom_components.naim_muso.media_browser import list_media, page_bounds
+
+ROWS = 10_000
+
+
+@pytest.fixture(name="converted")
+def converted_fixture(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Record the index of every row converted to browse media."""
+    converted = []
+    row_to_media = media_browser.row_to_media
+
+    def _row_to_media(path, row):
+        converted.append(row["index"])
+        return row_to_media(path, row)
+
+    monkeypatch.setattr(media_browser, "row_to_media", _row_to_media)
+    return converted
+
+
+def _rows(first: int, last: int) -> list[dict]:
+    """Return rows first to last, inclusive and counting from 1, of the list."""
+    return [
+        {"index": index, "text": f"Station {index}", "play": 1, "browse": 0}
+        for index in range(first - 1, last)
+    ]
+
+
+def test_browse_10k_rows(converted: list[int]) -> None:
+    """Only the rows of the page viewed are converted, every page the same."""
+    active_list = {"count": ROWS, "title": "Stations"}
+    pages = -(-ROWS // BROWSE_PAGE_SIZE)
+    timings = []
+    for page in (1, pages // 2, pages):
+        first, last = page_bounds(page, ROWS)
+        rows = _rows(first, last)
+        converted.clear()
+
+        started = time.perf_counter()
+        media = list_media((3,), active_list, rows, page, last)
+        timings.append(time.perf_counter() - started)
+
+        assert converted == list(range(first - 1, last))
+        assert len(converted) <= BROWSE_PAGE_SIZE
+        assert media.children[-1].title.startswith("More") == (page < pages)
+
+    print(
+        f"\n{ROWS} rows, {pages} pages of {BROWSE_PAGE_SIZE}: "
+        + ", ".join(f"{timing * 1000:.2f} ms" for timing in timings)
+    )
+
+
+def test_page_bounds_10k_rows() -> None:
+    """The pages cover every row of the list once."""
+    pages = -(-ROWS // BROWSE_PAGE_SIZE)
+    covered = []
+    for page in range(1, pages + 1):
+        first, last = page_bounds(page, ROWS)
+        covered.extend(range(first, last + 1))
+    assert covered == list(range(1, ROWS + 1))
+    first, last = page_bounds(pages + 1, ROWS)
+    assert last < first
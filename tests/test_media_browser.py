@@ -0,0 +1,109 @@
+"""Tests for the browse ids and paging of the media browser."""
+import pytest
+
+from custom_components.naim_muso.const import BROWSE_PAGE_SIZE
+from custom_components.naim_muso.media_browser import (
+    browse_id,
+    list_media,
+    page_bounds,
+    parse_browse_id,
+    row_to_media,
+)
+
+
+def _row(index: int, play: bool = False) -> dict:
+    """Return a GetRows row."""
+    return {
+        "index": index,
+        "text": f"Row {index}",
+        "play": 1 if play else 0,
+        "browse": 0 if play else 1,
+        "metadata": {"albumart_url": f"http://art/{index}.jpg"},
+    }
+
+
+@pytest.mark.parametrize(
+    ("path", "page", "content_id"),
+    [
+        ((), 1, "browse"),
+        ((), 2, "browse/p2"),
+        ((3,), 1, "browse/3"),
+        ((3, 5), 2, "browse/3/5/p2"),
+        ((0, 12, 7), 11, "browse/0/12/7/p11"),
+    ],
+)
+def test_browse_id_round_trip(path, page, content_id) -> None:
+    """Content ids hold the full path and the page."""
+    assert browse_id(path, page) == content_id
+    assert parse_browse_id(content_id) == (path, page)
+
+
+def test_page_bounds() -> None:
+    """Pages are BROWSE_PAGE_SIZE rows, counting from 1, the last one short."""
+    count = 2 * BROWSE_PAGE_SIZE + 50
+    assert page_bounds(1, count) == (1, BROWSE_PAGE_SIZE)
+    assert page_bounds(2, count) == (BROWSE_PAGE_SIZE + 1, 2 * BROWSE_PAGE_SIZE)
+    assert page_bounds(3, count) == (2 * BROWSE_PAGE_SIZE + 1, count)
+    first, last = page_bounds(4, count)
+    assert last < first
+
+
+def test_list_media_first_page() -> None:
+    """The first page of a sub list has a Back and a More entry."""
+    count = 2 * BROWSE_PAGE_SIZE + 50
+    active_list = {"count": count, "title": "Genres"}
+    first, last = page_bounds(1, count)
+    rows = [_row(index) for index in range(first - 1, last)]
+
+    media = list_media((3,), active_list, rows, 1, last)
+
+    assert media.media_content_id == "browse/3"
+    assert media.title == "Genres"
+    back, *entries, more = media.children
+    assert back.title == "Back"
+    assert back.media_content_id == "browse"
+    assert [entry.media_content_id for entry in entries[:2]] == [
+        "browse/3/0", "browse/3/1"
+    ]
+    assert len(entries) == BROWSE_PAGE_SIZE
+    assert more.media_content_id == "browse/3/p2"
+    assert more.title == (
+        f"More ({BROWSE_PAGE_SIZE + 1}-{2 * BROWSE_PAGE_SIZE} of {count})"
+    )
+
+
+def test_list_media_last_page() -> None:
+    """The last page has neither a Back nor a More entry."""
+    count = 2 * BROWSE_PAGE_SIZE + 50
+    active_list = {"count": count, "title": "Genres"}
+    first, last = page_bounds(3, count)
+    rows = [_row(index, play=True) for index in range(first - 1, last)]
+
+    media = list_media((3,), active_list, rows, 3, last)
+
+    assert media.media_content_id == "browse/3/p3"
+    assert media.title == "Genres (3)"
+    assert len(media.children) == 50
+    assert all(child.can_play for child in media.children)
+
+
+def test_list_media_top_list_single_page() -> None:
+    """The top list has no Back entry, a short list no More entry."""
+    media = list_media((), {"count": 2, "title": "Browse"}, [_row(0), _row(1)], 1, 2)
+
+    assert [child.media_content_id for child in media.children] == [
+        "browse/0", "browse/1"
+    ]
+
+
+def test_row_to_media() -> None:
+    """Rows become playable channels or expandable directories."""
+    playable = row_to_media((3,), _row(4, play=True))
+    assert playable.can_play and not playable.can_expand
+    assert playable.media_content_id == "browse/3/4"
+    assert playable.thumbnail == "http://art/4.jpg"
+
+    folder = row_to_media((3,), _row(5))
+    assert folder.can_expand and not folder.can_play
+
+    assert row_to_media((3,), {"index": 6, "text": "Odd"}) is None
@@ -0,0 +1,28 @@
+"""Tests for the media player of the naim Mu-so integration."""
+import asyncio
+from unittest.mock import MagicMock
+
+from custom_components.naim_muso.media_player import NaimMediaPlayer, async_setup_entry
+
+
+def test_setup_before_first_state() -> None:
+    """The media player is added while no state of the device is known yet."""
+    coordinator = MagicMock(data=None, connected=False, last_update_success=True)
+    entry = MagicMock()
+    entry.runtime_data.coordinator = coordinator
+    added = []
+
+    asyncio.run(async_setup_entry(MagicMock(), entry, added.extend))
+
+    (entity,) = added
+    assert isinstance(entity, NaimMediaPlayer)
+    assert not entity.available
+    assert entity.state is None
+    # Home Assistant reads these while adding the entity, even if unavailable
+    assert entity.entity_picture is None
+    assert entity.state_attributes == {}
+    assert entity.volume_level is None
+    assert entity.is_volume_muted is None
+    assert entity.source_list is None
+    assert entity.media_title is None
+    assert entity.media_position_updated_at is None